@@ -0,0 +1,109 @@
+#!/bin/bash
+# Create the daily_agg pre-aggregate table and schedule its nightly refresh
+# Dashboard trend queries read this table instead of system.access.audit
+
+set -e
+
+SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
+PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+
+# Load utilities
+source "$SCRIPT_DIR/utils.sh"
+
+print_header "Creating Daily Pre-Aggregates"
+
+# Load configuration
+CONFIG_FILE="$PROJECT_ROOT/config/workspace.yaml"
+load_config "$CONFIG_FILE"
+
+# Extract configuration values
+PROFILE=$(get_yaml_value "$CONFIG_FILE" "profile")
+HOST=$(get_yaml_value "$CONFIG_FILE" "host")
+CATALOG=$(get_yaml_value "$CONFIG_FILE" "catalog")
+SCHEMA=$(get_yaml_value "$CONFIG_FILE" "schema")
+WAREHOUSE_ID=$(get_yaml_value "$CONFIG_FILE" "warehouse_id")
+WORKSPACE_PATH=$(get_yaml_value "$CONFIG_FILE" "workspace_path")
+JOB_ID=$(get_yaml_value "$CONFIG_FILE" "aggregation_job_id")
+
+# Load token from .env
+if [ -f "$PROJECT_ROOT/.env" ]; then
+    export $(grep -v '^#' "$PROJECT_ROOT/.env" | xargs)
+fi
+
+TOKEN=$DATABRICKS_TOKEN
+
+print_info "Target: ${CATALOG}.${SCHEMA}.daily_agg"
+print_info "Warehouse: ${WAREHOUSE_ID}"
+
+# Step 1: Create the table and backfill it
+print_info "Creating table and backfilling the last 365 days..."
+
+while IFS= read -r line; do
+    # Skip empty lines and comments
+    if [[ -z "$line" ]] || [[ "$line" =~ ^[[:space:]]*--.*$ ]]; then
+        continue
+    fi
+
+    sql_statement="$sql_statement$line"$'\n'
+
+    if [[ "$line" =~ \;[[:space:]]*$ ]]; then
+        execute_sql \
+            "$sql_statement" \
+            "$(echo "$sql_statement" | head -1)" \
+            "$HOST" \
+            "$TOKEN" \
+            "$WAREHOUSE_ID"
+        sql_statement=""
+    fi
+done < <(replace_placeholders "$PROJECT_ROOT/sql/daily_agg.sql" "$CATALOG" "$SCHEMA" "$WAREHOUSE_ID" "")
+
+# Step 2: Upload the refresh statement
+print_info "Uploading refresh statement..."
+
+REFRESH_SQL="$PROJECT_ROOT/sql/daily_agg_refresh_deployed.sql"
+REFRESH_PATH="$WORKSPACE_PATH/sql/daily_agg_refresh.sql"
+replace_placeholders \
+    "$PROJECT_ROOT/sql/daily_agg_refresh.sql" \
+    "$CATALOG" \
+    "$SCHEMA" \
+    "$WAREHOUSE_ID" \
+    "" > "$REFRESH_SQL"
+
+unset DATABRICKS_HOST DATABRICKS_TOKEN
+databricks --profile "$PROFILE" workspace mkdirs "$WORKSPACE_PATH/sql"
+databricks --profile "$PROFILE" workspace import "$REFRESH_PATH" \
+    --file "$REFRESH_SQL" --format AUTO --overwrite
+
+rm -f "$REFRESH_SQL"
+
+print_success "Refresh statement uploaded to $REFRESH_PATH"
+
+# Step 3: Schedule the nightly refresh job
+if [ -n "$JOB_ID" ]; then
+    print_info "Aggregation job already configured: $JOB_ID"
+else
+    print_info "Creating nightly refresh job..."
+
+    JOB_ID=$(databricks --profile "$PROFILE" jobs create --json "{
+        \"name\": \"apps-telemetry-daily-agg\",
+        \"schedule\": {
+            \"quartz_cron_expression\": \"0 30 0 * * ?\",
+            \"timezone_id\": \"UTC\"
+        },
+        \"tasks\": [{
+            \"task_key\": \"refresh_daily_agg\",
+            \"sql_task\": {
+                \"warehouse_id\": \"$WAREHOUSE_ID\",
+                \"file\": {\"path\": \"$REFRESH_PATH\", \"source\": \"WORKSPACE\"}
+            }
+        }]
+    }" --output json | python3 -c "import sys, json; print(json.load(sys.stdin).get('job_id', ''))")
+
+    print_success "Created job $JOB_ID (daily at 00:30 UTC)"
+    print_info "Set app.aggregation_job_id: \"$JOB_ID\" in $CONFIG_FILE"
+fi
+
+echo ""
+print_header "Daily Pre-Aggregates Ready"
+echo ""
+print_info "Set USE_DAILY_AGG to \"true\" in src/app.yaml and redeploy to read trends from the rollup"
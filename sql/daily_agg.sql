@@ -0,0 +1,42 @@
+-- ====================================================================
+-- APPS TELEMETRY - DAILY PRE-AGGREGATES
+-- ====================================================================
+-- Purpose: Per-(day, hour, app, user) rollup of system.access.audit so
+--          dashboard trend queries read a small Delta table instead of
+--          the raw event log.
+-- Created by: deployment/create_daily_agg.sh
+-- Refreshed by: sql/daily_agg_refresh.sql (scheduled job)
+-- ====================================================================
+
+CREATE TABLE IF NOT EXISTS {{CATALOG}}.{{SCHEMA}}.daily_agg (
+  activity_date DATE,
+  hour_of_day INT,
+  workspace_id STRING,
+  app_id STRING,
+  app_name STRING,
+  user_email STRING,
+  click_count BIGINT,
+  http_error_count BIGINT
+) USING DELTA
+CLUSTER BY (activity_date, workspace_id)
+COMMENT 'Daily Apps usage rollup from system.access.audit';
+
+-- Backfill the last year (the longest range the dashboard accepts)
+INSERT INTO {{CATALOG}}.{{SCHEMA}}.daily_agg
+REPLACE WHERE activity_date >= CURRENT_DATE - INTERVAL 365 DAY AND activity_date < CURRENT_DATE
+SELECT
+  DATE(event_time) AS activity_date,
+  HOUR(event_time) AS hour_of_day,
+  workspace_id,
+  request_params.app_id AS app_id,
+  COALESCE(request_params.app_name, request_params.app_id, 'Unknown App') AS app_name,
+  user_identity.email AS user_email,
+  COUNT(*) AS click_count,
+  COUNT_IF(response.status_code >= 400) AS http_error_count
+FROM
+  system.access.audit
+WHERE
+  service_name = 'apps'
+  AND event_date >= CURRENT_DATE - INTERVAL 365 DAY
+  AND event_date < CURRENT_DATE
+GROUP BY ALL;
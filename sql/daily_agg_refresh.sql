@@ -0,0 +1,26 @@
+-- ====================================================================
+-- APPS TELEMETRY - DAILY PRE-AGGREGATE REFRESH
+-- ====================================================================
+-- Purpose: Nightly job statement for {{CATALOG}}.{{SCHEMA}}.daily_agg.
+--          Rewrites the last two closed days so late-arriving audit
+--          events are picked up; safe to re-run.
+-- ====================================================================
+
+INSERT INTO {{CATALOG}}.{{SCHEMA}}.daily_agg
+REPLACE WHERE activity_date >= CURRENT_DATE - INTERVAL 2 DAY AND activity_date < CURRENT_DATE
+SELECT
+  DATE(event_time) AS activity_date,
+  HOUR(event_time) AS hour_of_day,
+  workspace_id,
+  request_params.app_id AS app_id,
+  COALESCE(request_params.app_name, request_params.app_id, 'Unknown App') AS app_name,
+  user_identity.email AS user_email,
+  COUNT(*) AS click_count,
+  COUNT_IF(response.status_code >= 400) AS http_error_count
+FROM
+  system.access.audit
+WHERE
+  service_name = 'apps'
+  AND event_date >= CURRENT_DATE - INTERVAL 2 DAY
+  AND event_date < CURRENT_DATE
+GROUP BY ALL;
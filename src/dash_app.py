@@ -9,16 +9,26 @@ Created: 2025-11-08
 """
 
 import dash
-from dash import dcc, html, Input, Output, State, callback
+from dash import dcc, html, dash_table, Input, Output, State, callback, DiskcacheManager
+from dash.dash_table.Format import Format, Group, Scheme
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from datetime import datetime, timedelta
 import numpy as np
-from databricks import sql
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+import base64
+import diskcache
+import hashlib
 import os
+import queue
+import threading
+import time
 
 # ====================================================================
 # CONFIGURATION
@@ -36,6 +46,25 @@ class Config:
     # Refresh intervals (in milliseconds)
     REFRESH_INTERVAL = 300000  # 5 minutes
     
+    # Concurrent dashboard queries share a pool of warehouse connections
+    QUERY_WORKERS = 7
+    POOL_SIZE = int(os.getenv('DATABRICKS_POOL_SIZE', '8'))
+    
+    # Max points sent to the browser per time-series trace (zoom re-resamples)
+    RESAMPLER_POINTS = 500
+    RESAMPLER_TTL_SECONDS = 3600  # Idle time before a chart's zoom state is dropped
+    
+    BACKGROUND_CACHE_DIR = os.getenv('BACKGROUND_CACHE_DIR', '/tmp/apps-telemetry-background')
+    DATE_RANGES = (7, 30, 90)  # Date range dropdown options, in days
+    
+    # Shared snapshot refresh: how often the snapshot is rebuilt, how often each
+    # process checks whether one is due, how long one process may hold the
+    # refresh, and how long a manual refresh waits
+    REFRESH_SECONDS = REFRESH_INTERVAL // 1000
+    REFRESH_POLL_SECONDS = 5
+    REFRESH_LEASE_SECONDS = 600
+    REFRESH_WAIT_SECONDS = 120
+    
     # Color scheme
     COLORS = {
         'primary': '#4A90E2',
@@ -43,6 +72,7 @@ class Config:
         'warning': '#FFA500',
         'danger': '#FF6B6B',
         'info': '#7B68EE',
+        'secondary': '#6C757D',
         'background': '#F8F9FA',
         'text': '#212529'
     }
@@ -51,75 +81,182 @@ class Config:
 # DATABASE CONNECTION
 # ====================================================================
 
-class DatabricksConnection:
-    """Manages Databricks SQL connection"""
+class ConnectionPool:
+    """Pool of reusable Databricks SQL connections"""
     
-    def __init__(self):
-        self.connection = None
+    def __init__(self, size=Config.POOL_SIZE):
+        self.size = size
+        self._reset()
+    
+    def _reset(self):
+        """Start with an empty pool owned by the current process"""
+        self._pool = queue.Queue(maxsize=self.size)
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
     
     def connect(self):
-        """Establish connection to Databricks"""
+        """Establish a new connection to Databricks"""
+        from databricks import sql
+        
         try:
-            self.connection = sql.connect(
+            return sql.connect(
                 server_hostname=Config.DATABRICKS_SERVER_HOSTNAME,
                 http_path=Config.DATABRICKS_HTTP_PATH,
                 access_token=Config.DATABRICKS_TOKEN
             )
-            return self.connection
         except Exception as e:
             print(f"Error connecting to Databricks: {e}")
             return None
     
-    def execute_query(self, query):
-        """Execute SQL query and return DataFrame"""
+    def _checkout(self):
+        """Take an idle connection, opening a new one while under size"""
+        # Background callback workers are forked; never reuse the parent's sockets
+        if self._pid != os.getpid():
+            self._reset()
+        
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        
+        if not can_open:
+            return self._pool.get()
+        
+        connection = self.connect()
+        if connection is None:
+            with self._lock:
+                self._opened -= 1
+        return connection
+    
+    def _discard(self, connection):
+        """Drop a broken connection so its slot is reconnected on next borrow"""
+        with self._lock:
+            self._opened -= 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+    
+    @contextmanager
+    def borrow(self):
+        """Check out a connection for the duration of a with-block"""
+        connection = self._checkout()
+        if connection is None:
+            raise ConnectionError("Unable to connect to Databricks")
+        
+        try:
+            yield connection
+        except Exception:
+            self._discard(connection)
+            raise
+        else:
+            self._pool.put(connection)
+    
+    def execute_query(self, query, params=None):
+        """Execute SQL query on a pooled connection and return DataFrame"""
         try:
-            if not self.connection:
-                self.connect()
-            
-            cursor = self.connection.cursor()
-            cursor.execute(query)
-            
-            # Fetch results and convert to DataFrame
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
-            df = pd.DataFrame(data, columns=columns)
-            
-            cursor.close()
-            return df
+            with self.borrow() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query, params)
+                
+                # Fetch results column-wise as Arrow and wrap the buffers in pandas
+                table = downcast_table(cursor.fetchall_arrow())
+                df = table.to_pandas(types_mapper=pd.ArrowDtype)
+                
+                cursor.close()
+                return df
         
         except Exception as e:
             print(f"Error executing query: {e}")
             return pd.DataFrame()
     
     def close(self):
-        """Close connection"""
-        if self.connection:
-            self.connection.close()
+        """Close all idle pooled connections"""
+        while True:
+            try:
+                connection = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
+
+# Count-like result columns, matched by name suffix, narrowed to int32 when
+# every value fits; float columns stay 64-bit because plotly serializes
+# float32 at full binary precision (10.3 -> 10.300000190734863)
+INT32_SUFFIXES = ('_count', '_users', '_apps', '_clicks', '_requests', '_interactions', '_accessed',
+                  '_active', '_hour', '_of_day', '_monday_first')
+INT32_RANGE = np.iinfo(np.int32)
+
+def _fits_int32(column):
+    """Whether every value of an integer column fits in int32 (all-null columns do)"""
+    bounds = pc.min_max(column)
+    low, high = bounds['min'].as_py(), bounds['max'].as_py()
+    return low is None or (INT32_RANGE.min <= low and high <= INT32_RANGE.max)
+
+def downcast_table(table):
+    """Narrow count columns to int32 where every value fits; larger ones stay int64"""
+    return table.cast(pa.schema([
+        field.with_type(pa.int32())
+        if pa.types.is_integer(field.type) and field.name.endswith(INT32_SUFFIXES)
+        and _fits_int32(column) else field
+        for field, column in zip(table.schema, table.columns)
+    ]))
 
 # Initialize connection
-db_conn = DatabricksConnection()
+db_conn = ConnectionPool()
 
 # ====================================================================
 # DATA QUERIES
 # ====================================================================
 
 class DataQueries:
-    """SQL queries for dashboard data"""
+    """SQL queries for dashboard data
+    
+    Each query returns (sql, params). The date window and row limits are
+    bound as the :days_back and :limit parameters so the SQL text is
+    identical across calls.
+    """
+    
+    # App open/start/view actions
+    APP_ACTIONS = "action_name IN ('openApp', 'startApp', 'accessApp', 'viewApp', 'executeApp')"
+    
+    # App access events inside the requested window
+    APP_ACCESS_FILTER = f"""service_name = 'apps'
+          AND event_date >= DATE_SUB(CURRENT_DATE, :days_back)
+          AND {APP_ACTIONS}"""
+    
+    # Request failure condition shared by the error metrics
+    FAILED = "(response.status_code >= 400 OR response.error_message IS NOT NULL)"
     
     @staticmethod
-    def get_kpi_summary(days_back=30):
+    def get_activity_summary(days_back=30):
+        # One scan for both the KPI totals (is_total = 1) and the daily error series;
+        # the KPI metrics only count app access actions
         return f"""
         SELECT
-          COUNT(DISTINCT user_identity.email) AS total_unique_users,
-          COUNT(DISTINCT request_params.app_id) AS total_unique_apps,
-          COUNT(*) AS total_interactions,
-          ROUND(COUNT(*) * 1.0 / NULLIF(COUNT(DISTINCT user_identity.email), 0), 2) AS avg_interactions_per_user,
-          ROUND(SUM(CASE WHEN response.status_code >= 400 OR response.error_message IS NOT NULL THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 2) AS overall_error_rate
+          DATE(event_time) AS activity_date,
+          GROUPING(DATE(event_time)) AS is_total,
+          COUNT(*) AS total_requests,
+          SUM(CASE WHEN response.status_code BETWEEN 200 AND 299 THEN 1 ELSE 0 END) AS successful_requests,
+          SUM(CASE WHEN {DataQueries.FAILED} THEN 1 ELSE 0 END) AS failed_requests,
+          ROUND(SUM(CASE WHEN {DataQueries.FAILED} THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 2) AS error_rate_percentage,
+          COUNT(DISTINCT user_identity.email) FILTER (WHERE {DataQueries.APP_ACTIONS}) AS total_unique_users,
+          COUNT(DISTINCT request_params.app_id) FILTER (WHERE {DataQueries.APP_ACTIONS}) AS total_unique_apps,
+          COUNT(*) FILTER (WHERE {DataQueries.APP_ACTIONS}) AS total_interactions,
+          ROUND(COUNT(*) FILTER (WHERE {DataQueries.APP_ACTIONS}) * 1.0
+                / NULLIF(COUNT(DISTINCT user_identity.email) FILTER (WHERE {DataQueries.APP_ACTIONS}), 0), 2) AS avg_interactions_per_user,
+          ROUND(COUNT(*) FILTER (WHERE {DataQueries.APP_ACTIONS} AND {DataQueries.FAILED}) * 100.0
+                / NULLIF(COUNT(*) FILTER (WHERE {DataQueries.APP_ACTIONS}), 0), 2) AS overall_error_rate
         FROM system.access.audit
         WHERE service_name = 'apps'
-          AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-          AND action_name IN ('openApp', 'startApp', 'accessApp', 'viewApp', 'executeApp')
-        """
+          AND event_date >= DATE_SUB(CURRENT_DATE, :days_back)
+        GROUP BY GROUPING SETS ((), (DATE(event_time)))
+        """, {'days_back': days_back}
     
     @staticmethod
     def get_dau_trend(days_back=90):
@@ -130,12 +267,10 @@ class DataQueries:
           COUNT(*) AS total_clicks,
           COUNT(DISTINCT request_params.app_id) AS apps_accessed
         FROM system.access.audit
-        WHERE service_name = 'apps'
-          AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-          AND action_name IN ('openApp', 'startApp', 'accessApp', 'viewApp', 'executeApp')
+        WHERE {DataQueries.APP_ACCESS_FILTER}
         GROUP BY DATE(event_time)
         ORDER BY activity_date ASC
-        """
+        """, {'days_back': days_back}
     
     @staticmethod
     def get_top_apps(days_back=30, limit=10):
@@ -146,78 +281,44 @@ class DataQueries:
           COUNT(DISTINCT user_identity.email) AS unique_users,
           ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) AS percentage_of_total
         FROM system.access.audit
-        WHERE service_name = 'apps'
-          AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-          AND action_name IN ('openApp', 'startApp', 'accessApp', 'viewApp', 'executeApp')
+        WHERE {DataQueries.APP_ACCESS_FILTER}
         GROUP BY request_params.app_name
         ORDER BY click_count DESC
-        LIMIT {limit}
-        """
+        LIMIT :limit
+        """, {'days_back': days_back, 'limit': int(limit)}
     
     @staticmethod
     def get_usage_heatmap(days_back=30):
+        # Only non-empty cells; day index is Monday-first (0 = Monday)
         return f"""
         SELECT
-          DAYOFWEEK(event_time) AS day_of_week,
-          CASE DAYOFWEEK(event_time)
-            WHEN 1 THEN 'Sunday'
-            WHEN 2 THEN 'Monday'
-            WHEN 3 THEN 'Tuesday'
-            WHEN 4 THEN 'Wednesday'
-            WHEN 5 THEN 'Thursday'
-            WHEN 6 THEN 'Friday'
-            WHEN 7 THEN 'Saturday'
-          END AS day_name,
+          MOD(DAYOFWEEK(event_time) + 5, 7) AS day_of_week_monday_first,
           HOUR(event_time) AS hour_of_day,
           COUNT(*) AS click_count
         FROM system.access.audit
-        WHERE service_name = 'apps'
-          AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-          AND action_name IN ('openApp', 'startApp', 'accessApp', 'viewApp', 'executeApp')
-        GROUP BY DAYOFWEEK(event_time), day_name, HOUR(event_time)
-        ORDER BY day_of_week, hour_of_day
-        """
+        WHERE {DataQueries.APP_ACCESS_FILTER}
+        GROUP BY MOD(DAYOFWEEK(event_time) + 5, 7), HOUR(event_time)
+        """, {'days_back': days_back}
     
     @staticmethod
     def get_user_cohorts(days_back=30):
+        # Single scan: first activity comes from a window over the same rows
         return f"""
-        WITH user_first_interaction AS (
+        SELECT
+          activity_date,
+          COUNT(DISTINCT CASE WHEN activity_date = first_interaction_date THEN email END) AS new_users,
+          COUNT(DISTINCT CASE WHEN activity_date > first_interaction_date THEN email END) AS returning_users
+        FROM (
           SELECT
-            user_identity.email,
-            MIN(DATE(event_time)) AS first_interaction_date
+            DATE(event_time) AS activity_date,
+            user_identity.email AS email,
+            MIN(DATE(event_time)) OVER (PARTITION BY user_identity.email) AS first_interaction_date
           FROM system.access.audit
-          WHERE service_name = 'apps'
-            AND action_name IN ('openApp', 'startApp', 'accessApp', 'viewApp', 'executeApp')
-          GROUP BY user_identity.email
+          WHERE {DataQueries.APP_ACCESS_FILTER}
         )
-        SELECT
-          DATE(a.event_time) AS activity_date,
-          COUNT(DISTINCT CASE WHEN DATE(a.event_time) = ufi.first_interaction_date THEN a.user_identity.email END) AS new_users,
-          COUNT(DISTINCT CASE WHEN DATE(a.event_time) > ufi.first_interaction_date THEN a.user_identity.email END) AS returning_users
-        FROM system.access.audit a
-        JOIN user_first_interaction ufi ON a.user_identity.email = ufi.email
-        WHERE a.service_name = 'apps'
-          AND a.event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-          AND a.action_name IN ('openApp', 'startApp', 'accessApp', 'viewApp', 'executeApp')
-        GROUP BY DATE(a.event_time)
-        ORDER BY activity_date ASC
-        """
-    
-    @staticmethod
-    def get_error_monitoring(days_back=30):
-        return f"""
-        SELECT
-          DATE(event_time) AS activity_date,
-          COUNT(*) AS total_requests,
-          SUM(CASE WHEN response.status_code BETWEEN 200 AND 299 THEN 1 ELSE 0 END) AS successful_requests,
-          SUM(CASE WHEN response.status_code >= 400 OR response.error_message IS NOT NULL THEN 1 ELSE 0 END) AS failed_requests,
-          ROUND(SUM(CASE WHEN response.status_code >= 400 OR response.error_message IS NOT NULL THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 2) AS error_rate_percentage
-        FROM system.access.audit
-        WHERE service_name = 'apps'
-          AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-        GROUP BY DATE(event_time)
+        GROUP BY activity_date
         ORDER BY activity_date ASC
-        """
+        """, {'days_back': days_back}
     
     @staticmethod
     def get_user_segmentation(days_back=30, limit=100):
@@ -235,13 +336,61 @@ class DataQueries:
             ELSE 'Casual User'
           END AS user_segment
         FROM system.access.audit
-        WHERE service_name = 'apps'
-          AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-          AND action_name IN ('openApp', 'startApp', 'accessApp', 'viewApp', 'executeApp')
+        WHERE {DataQueries.APP_ACCESS_FILTER}
         GROUP BY user_identity.email
         ORDER BY total_clicks DESC
-        LIMIT {limit}
-        """
+        LIMIT :limit
+        """, {'days_back': days_back, 'limit': int(limit)}
+
+# ====================================================================
+# STORE SERIALIZATION
+# ====================================================================
+
+def encode_frame(df):
+    """Serialize a DataFrame as base64 Arrow IPC for a dcc.Store"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return {
+        'schema': table.schema.names,
+        'num_rows': table.num_rows,
+        'data_b64': base64.b64encode(sink.getvalue().to_pybytes()).decode('ascii')
+    }
+
+def has_rows(charts_data, key):
+    """Whether the charts store holds a non-empty payload for key (nothing is decoded)"""
+    return bool(charts_data) and charts_data.get(key, {}).get('num_rows', 0) > 0
+
+def decode_frame(payload):
+    """Rebuild a DataFrame from an encode_frame payload"""
+    table = pa.ipc.open_stream(base64.b64decode(payload['data_b64'])).read_all()
+    # Plain numpy-backed columns: plotly does not accept Arrow date types
+    return table.to_pandas(ignore_metadata=True)
+
+def _cols(data_b64, *names):
+    """Read named columns from an encode_frame payload as numpy arrays"""
+    table = pa.ipc.open_stream(base64.b64decode(data_b64)).read_all()
+    return tuple(table.column(name).to_numpy() for name in names)
+
+# ====================================================================
+# DATA TRANSFORMS
+# ====================================================================
+
+def _scatter_to_grid(days, hours, counts):
+    """Accumulate (day, hour, count) rows into a 7x24 day-by-hour grid"""
+    grid = np.zeros((7, 24), dtype=np.int64)
+    for i in range(days.shape[0]):
+        grid[days[i], hours[i]] += counts[i]
+    return grid
+
+# numba is imported and the kernel compiled (or loaded from its on-disk cache)
+# on the first heatmap render, not at import
+@lru_cache(maxsize=None)
+def _get_scatter_to_grid():
+    """_scatter_to_grid compiled by numba, on first use"""
+    from numba import njit
+    return njit(cache=True, fastmath=True)(_scatter_to_grid)
 
 # ====================================================================
 # DASH APP INITIALIZATION
@@ -252,9 +401,66 @@ app = dash.Dash(
     __name__,
     external_stylesheets=[dbc.themes.BOOTSTRAP],
     suppress_callback_exceptions=True,
-    title="Apps Telemetry Dashboard"
+    title="Apps Telemetry Dashboard",
+    # assets/custom.css is the enhanced dashboard's theme
+    assets_ignore=r'custom\.css'
 )
 
+# Background callbacks run in worker processes, coordinated through a disk cache
+background_callback_manager = DiskcacheManager(diskcache.Cache(Config.BACKGROUND_CACHE_DIR))
+
+# Latest (kpi_data, charts_data) per date range, refreshed by the background scheduler;
+# kept on disk so background callback workers see the scheduler's results
+LATEST = diskcache.Cache(os.path.join(Config.BACKGROUND_CACHE_DIR, 'latest'))
+
+# Plotting helpers not needed until the first figure is built are imported on
+# first use so they stay off the startup path
+@lru_cache(maxsize=None)
+def _get_px():
+    """plotly.express, imported once on first use"""
+    import plotly.express as px
+    return px
+
+def secondary_y_figure(x_title, y_title, y2_title):
+    """Empty figure with a right-hand secondary y axis, laid out as make_subplots would"""
+    return go.Figure(layout=dict(
+        xaxis=dict(domain=[0.0, 0.94], anchor='y', title_text=x_title),
+        yaxis=dict(domain=[0.0, 1.0], anchor='x', title_text=y_title),
+        yaxis2=dict(anchor='x', overlaying='y', side='right', title_text=y2_title)
+    ))
+
+# Shown for a chart whose store payload holds no rows
+EMPTY_FIGURE = go.Figure().to_plotly_json()
+
+# Server-side resampled figures for zoom updates, shared by every worker process.
+# Keyed by graph and data content, so browsers showing the same data share one
+# entry and a zoom request can be served by any worker
+RESAMPLED = diskcache.Cache(os.path.join(Config.BACKGROUND_CACHE_DIR, 'resampled'))
+
+def create_resampled_figure(fig):
+    """Wrap a time-series figure so only aggregated visible points are sent"""
+    from plotly_resampler import FigureResampler
+    
+    return FigureResampler(fig, default_n_shown_samples=Config.RESAMPLER_POINTS)
+
+def show_resampled_figure(graph_id, data_b64, built):
+    """Share a built (resampler, figure JSON) pair for zoom updates.
+
+    Returns the figure JSON and the resampler key for the graph's key store.
+    """
+    fig, fig_json = built
+    key = f"{graph_id}:{hashlib.sha1(data_b64.encode()).hexdigest()}"
+    if not RESAMPLED.touch(key, expire=Config.RESAMPLER_TTL_SECONDS):
+        RESAMPLED.set(key, fig, expire=Config.RESAMPLER_TTL_SECONDS)
+    return fig_json, key
+
+def resample_figure(key, relayout_data):
+    """Patch a resampled figure with the points visible after a zoom/pan"""
+    fig = RESAMPLED.get(key) if key else None
+    if fig is None or not relayout_data:
+        return dash.no_update
+    return fig.construct_update_data_patch(relayout_data)
+
 # ====================================================================
 # LAYOUT COMPONENTS
 # ====================================================================
@@ -315,9 +521,8 @@ def create_filters():
                     dcc.Dropdown(
                         id='date-range-dropdown',
                         options=[
-                            {'label': 'Last 7 Days', 'value': 7},
-                            {'label': 'Last 30 Days', 'value': 30},
-                            {'label': 'Last 90 Days', 'value': 90},
+                            {'label': f'Last {days} Days', 'value': days}
+                            for days in Config.DATE_RANGES
                         ],
                         value=30,
                         clearable=False
@@ -360,6 +565,8 @@ app.layout = dbc.Container([
     # Hidden div to store data
     dcc.Store(id='kpi-data-store'),
     dcc.Store(id='charts-data-store'),
+    dcc.Store(id='dau-trend-resampler'),
+    dcc.Store(id='error-monitoring-resampler'),
     
     # Auto-refresh interval
     dcc.Interval(
@@ -479,16 +686,24 @@ app.layout = dbc.Container([
 # CALLBACKS
 # ====================================================================
 
-@app.callback(
+# Last refresh timestamp is formatted in the browser, no server round-trip
+app.clientside_callback(
+    """
+    function(n_intervals, n_clicks, auto_refresh) {
+        const triggered = window.dash_clientside.callback_context.triggered.map(t => t.prop_id);
+        if (triggered.includes('interval-component.n_intervals') && !auto_refresh) {
+            return window.dash_clientside.no_update;
+        }
+        // Shift to local time so toISOString() yields a local wall-clock stamp
+        const local = new Date(Date.now() - new Date().getTimezoneOffset() * 60000);
+        return 'Last updated: ' + local.toISOString().replace('T', ' ').slice(0, 19);
+    }
+    """,
     Output('last-update-time', 'children'),
     Input('interval-component', 'n_intervals'),
     Input('refresh-button', 'n_clicks'),
     State('auto-refresh-switch', 'value')
 )
-def update_timestamp(n_intervals, n_clicks, auto_refresh):
-    """Update last refresh timestamp"""
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    return f"Last updated: {now}"
 
 @app.callback(
     [Output('kpi-data-store', 'data'),
@@ -496,10 +711,13 @@ def update_timestamp(n_intervals, n_clicks, auto_refresh):
     [Input('interval-component', 'n_intervals'),
      Input('refresh-button', 'n_clicks'),
      Input('date-range-dropdown', 'value')],
-    State('auto-refresh-switch', 'value')
+    State('auto-refresh-switch', 'value'),
+    background=True,
+    manager=background_callback_manager,
+    running=[(Output('refresh-button', 'disabled'), True, False)]
 )
 def fetch_data(n_intervals, n_clicks, days_back, auto_refresh):
-    """Fetch all data from Databricks"""
+    """Serve dashboard data from the shared scheduler snapshot"""
     
     # Only refresh if auto-refresh is enabled or manual refresh clicked
     ctx = dash.callback_context
@@ -508,107 +726,228 @@ def fetch_data(n_intervals, n_clicks, days_back, auto_refresh):
     
     trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
     if trigger_id == 'interval-component' and not auto_refresh:
-        return dash.no_update, dash.no_update
+        raise PreventUpdate
     
-    # Fetch KPI data
-    kpi_df = db_conn.execute_query(DataQueries.get_kpi_summary(days_back))
-    kpi_data = kpi_df.to_dict('records')[0] if not kpi_df.empty else {}
+    # Manual refresh (or a range with no snapshot yet) asks the scheduler for a
+    # refresh and waits for it; the callback itself never runs SQL
+    if trigger_id == 'refresh-button' or days_back not in LATEST:
+        wait_for_refresh(request_refresh())
     
-    # Fetch charts data
-    charts_data = {
-        'dau_trend': db_conn.execute_query(DataQueries.get_dau_trend(days_back)).to_dict('records'),
-        'top_apps': db_conn.execute_query(DataQueries.get_top_apps(days_back)).to_dict('records'),
-        'usage_heatmap': db_conn.execute_query(DataQueries.get_usage_heatmap(days_back)).to_dict('records'),
-        'user_cohorts': db_conn.execute_query(DataQueries.get_user_cohorts(days_back)).to_dict('records'),
-        'error_monitoring': db_conn.execute_query(DataQueries.get_error_monitoring(days_back)).to_dict('records'),
-        'user_segmentation': db_conn.execute_query(DataQueries.get_user_segmentation(days_back)).to_dict('records')
+    return LATEST.get(days_back, ({}, {}))
+
+KPI_COLUMNS = ['total_unique_users', 'total_unique_apps', 'total_interactions',
+               'avg_interactions_per_user', 'overall_error_rate']
+ERROR_MONITORING_COLUMNS = ['activity_date', 'total_requests', 'successful_requests',
+                            'failed_requests', 'error_rate_percentage']
+
+def fetch_all_queries(days_back):
+    """Run all dashboard queries for a date range and encode them for the stores"""
+    queries = {
+        'activity_summary': DataQueries.get_activity_summary(days_back),
+        'dau_trend': DataQueries.get_dau_trend(days_back),
+        'top_apps': DataQueries.get_top_apps(days_back),
+        'usage_heatmap': DataQueries.get_usage_heatmap(days_back),
+        'user_cohorts': DataQueries.get_user_cohorts(days_back),
+        'user_segmentation': DataQueries.get_user_segmentation(days_back)
     }
     
+    # Queries are independent round-trips to the warehouse, so run them concurrently
+    results = {}
+    with ThreadPoolExecutor(max_workers=Config.QUERY_WORKERS) as executor:
+        futures = {
+            executor.submit(db_conn.execute_query, query, params): key
+            for key, (query, params) in queries.items()
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    
+    # Split the combined summary into the KPI totals row and the daily error series
+    summary = results.pop('activity_summary')
+    kpi_data = {}
+    results['error_monitoring'] = summary
+    if not summary.empty:
+        is_total = (summary['is_total'] == 1).to_numpy(dtype=bool)
+        kpi_data = summary.loc[is_total, KPI_COLUMNS].to_dict('records')[0]
+        results['error_monitoring'] = (
+            summary.loc[~is_total, ERROR_MONITORING_COLUMNS]
+            .sort_values('activity_date')
+            .reset_index(drop=True)
+        )
+    
+    # Only the rows shown in the segmentation table are sent to the browser
+    results['user_segmentation'] = results['user_segmentation'].head(25)
+    
+    charts_data = {key: encode_frame(df) for key, df in results.items()}
+    
     return kpi_data, charts_data
 
+def keep_previous_panels(previous, current):
+    """New snapshot, with any panel whose query came back empty or failed kept
+    from the previous one, so one warehouse error does not blank it for an interval"""
+    previous_kpi, previous_charts = previous
+    kpi_data, charts_data = current
+    charts_data = {
+        key: payload if payload['num_rows'] or key not in previous_charts else previous_charts[key]
+        for key, payload in charts_data.items()
+    }
+    return kpi_data or previous_kpi, charts_data
+
+def request_refresh():
+    """Ask the scheduler for a refresh ahead of its interval; returns the request time"""
+    requested_at = time.time()
+    LATEST['refresh_requested'] = requested_at
+    return requested_at
+
+def wait_for_refresh(requested_at):
+    """Block until a refresh started at or after requested_at has published"""
+    deadline = time.monotonic() + Config.REFRESH_WAIT_SECONDS
+    while LATEST.get('refreshed_at', 0) < requested_at and time.monotonic() < deadline:
+        time.sleep(0.5)
+
+def refresh_latest():
+    """Scheduled job: refresh the shared snapshot for every date range when due or requested"""
+    refreshed_at = LATEST.get('refreshed_at', 0)
+    due = time.time() - refreshed_at >= Config.REFRESH_SECONDS
+    if not due and LATEST.get('refresh_requested', 0) <= refreshed_at:
+        return
+    
+    # Every worker process polls, but only the one holding the lease queries the
+    # warehouse, so refresh cost does not grow with the number of workers
+    if not LATEST.add('refresh_lease', os.getpid(), expire=Config.REFRESH_LEASE_SECONDS):
+        return
+    try:
+        started_at = time.time()
+        for days_back in Config.DATE_RANGES:
+            LATEST[days_back] = keep_previous_panels(
+                LATEST.get(days_back, ({}, {})), fetch_all_queries(days_back)
+            )
+        LATEST['refreshed_at'] = started_at
+    finally:
+        LATEST.delete('refresh_lease')
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+@app.server.before_request
+def start_scheduler():
+    """Start this process's refresh scheduler on its first request, once the server is up"""
+    global _scheduler
+    if _scheduler is not None:
+        return
+    with _scheduler_lock:
+        if _scheduler is None:
+            from apscheduler.schedulers.background import BackgroundScheduler
+            scheduler = BackgroundScheduler(daemon=True)
+            scheduler.add_job(
+                refresh_latest,
+                'interval',
+                seconds=Config.REFRESH_POLL_SECONDS,
+                next_run_time=datetime.now(),
+                max_instances=1,
+                coalesce=True
+            )
+            scheduler.start()
+            _scheduler = scheduler
+
 @app.callback(
     [Output('kpi-card-1', 'children'),
      Output('kpi-card-2', 'children'),
      Output('kpi-card-3', 'children'),
      Output('kpi-card-4', 'children')],
-    Input('kpi-data-store', 'data')
+    Input('kpi-data-store', 'data'),
+    prevent_initial_call=True
 )
 def update_kpi_cards(kpi_data):
     """Update KPI cards"""
     if not kpi_data:
         return [html.Div("Loading...")] * 4
     
+    # Identical numbers (common between interval ticks) reuse the cached cards
+    return build_kpi_cards(
+        kpi_data.get('total_unique_users', 0),
+        kpi_data.get('total_unique_apps', 0),
+        kpi_data.get('total_interactions', 0),
+        round(kpi_data.get('overall_error_rate') or 0, 2)
+    )
+
+@lru_cache(maxsize=32)
+def build_kpi_cards(total_users, total_apps, total_interactions, error_rate):
+    """Build the four KPI cards for a set of summary values"""
     card1 = create_kpi_card(
         "Total Unique Users",
-        f"{kpi_data.get('total_unique_users', 0):,}",
+        f"{total_users:,}",
         "people-fill",
         Config.COLORS['primary']
     )
     
     card2 = create_kpi_card(
         "Active Apps",
-        f"{kpi_data.get('total_unique_apps', 0):,}",
+        f"{total_apps:,}",
         "app-indicator",
         Config.COLORS['info']
     )
     
     card3 = create_kpi_card(
         "Total Interactions",
-        f"{kpi_data.get('total_interactions', 0):,}",
+        f"{total_interactions:,}",
         "activity",
         Config.COLORS['success']
     )
     
     card4 = create_kpi_card(
         "Error Rate",
-        f"{kpi_data.get('overall_error_rate', 0):.2f}%",
+        f"{error_rate:.2f}%",
         "exclamation-triangle-fill",
-        Config.COLORS['danger'] if kpi_data.get('overall_error_rate', 0) > 5 else Config.COLORS['success']
+        Config.COLORS['danger'] if error_rate > 5 else Config.COLORS['success']
     )
     
     return card1, card2, card3, card4
 
 @app.callback(
     Output('dau-trend-chart', 'figure'),
-    Input('charts-data-store', 'data')
+    Output('dau-trend-resampler', 'data'),
+    Input('charts-data-store', 'data'),
+    prevent_initial_call=True
 )
 def update_dau_chart(charts_data):
     """Update DAU trend chart"""
-    if not charts_data or 'dau_trend' not in charts_data:
-        return go.Figure()
+    if not has_rows(charts_data, 'dau_trend'):
+        return EMPTY_FIGURE, None
     
-    df = pd.DataFrame(charts_data['dau_trend'])
-    if df.empty:
-        return go.Figure()
+    data_b64 = charts_data['dau_trend']['data_b64']
+    return show_resampled_figure('dau-trend-chart', data_b64, build_dau_figure(data_b64))
+
+@lru_cache(maxsize=16)
+def build_dau_figure(data_b64):
+    """Build the DAU trend figure for a store payload"""
+    dates, daily_users, total_clicks = _cols(
+        data_b64, 'activity_date', 'daily_active_users', 'total_clicks'
+    )
+    dates = dates.astype('datetime64[ns]')
     
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig = secondary_y_figure("Date", "Daily Active Users", "Total Clicks")
     
     fig.add_trace(
         go.Scatter(
-            x=df['activity_date'],
-            y=df['daily_active_users'],
+            x=dates,
+            y=daily_users,
             name='Daily Active Users',
             line=dict(color=Config.COLORS['primary'], width=3),
             mode='lines+markers'
-        ),
-        secondary_y=False
+        )
     )
     
     fig.add_trace(
         go.Scatter(
-            x=df['activity_date'],
-            y=df['total_clicks'],
+            x=dates,
+            y=total_clicks,
             name='Total Clicks',
             line=dict(color=Config.COLORS['danger'], width=2, dash='dash'),
-            mode='lines'
-        ),
-        secondary_y=True
+            mode='lines',
+            yaxis='y2'
+        )
     )
     
-    fig.update_xaxes(title_text="Date")
-    fig.update_yaxes(title_text="Daily Active Users", secondary_y=False)
-    fig.update_yaxes(title_text="Total Clicks", secondary_y=True)
-    
     fig.update_layout(
         hovermode='x unified',
         template='plotly_white',
@@ -616,23 +955,39 @@ def update_dau_chart(charts_data):
         margin=dict(l=20, r=20, t=30, b=20)
     )
     
-    return fig
+    fig = create_resampled_figure(fig)
+    return fig, fig.to_plotly_json()
+
+@app.callback(
+    Output('dau-trend-chart', 'figure', allow_duplicate=True),
+    Input('dau-trend-chart', 'relayoutData'),
+    State('dau-trend-resampler', 'data'),
+    prevent_initial_call=True
+)
+def resample_dau_chart(relayout_data, resampler_key):
+    """Resample DAU traces to the zoomed range"""
+    return resample_figure(resampler_key, relayout_data)
 
 @app.callback(
     Output('top-apps-chart', 'figure'),
-    Input('charts-data-store', 'data')
+    Input('charts-data-store', 'data'),
+    prevent_initial_call=True
 )
 def update_top_apps_chart(charts_data):
     """Update top apps chart"""
-    if not charts_data or 'top_apps' not in charts_data:
-        return go.Figure()
-    
-    df = pd.DataFrame(charts_data['top_apps'])
-    if df.empty:
-        return go.Figure()
+    if not has_rows(charts_data, 'top_apps'):
+        return EMPTY_FIGURE
     
-    fig = px.bar(
-        df,
+    return build_top_apps_figure(charts_data['top_apps']['data_b64'])
+
+@lru_cache(maxsize=16)
+def build_top_apps_figure(data_b64):
+    """Build the top apps figure for a store payload"""
+    app_names, click_counts, unique_users = _cols(
+        data_b64, 'app_name', 'click_count', 'unique_users'
+    )
+    fig = _get_px().bar(
+        {'app_name': app_names, 'click_count': click_counts, 'unique_users': unique_users},
         y='app_name',
         x='click_count',
         color='unique_users',
@@ -649,32 +1004,38 @@ def update_top_apps_chart(charts_data):
         yaxis={'categoryorder': 'total ascending'}
     )
     
-    return fig
+    return fig.to_plotly_json()
 
 @app.callback(
     Output('usage-heatmap', 'figure'),
-    Input('charts-data-store', 'data')
+    Input('charts-data-store', 'data'),
+    prevent_initial_call=True
 )
 def update_usage_heatmap(charts_data):
     """Update usage heatmap"""
-    if not charts_data or 'usage_heatmap' not in charts_data:
-        return go.Figure()
-    
-    df = pd.DataFrame(charts_data['usage_heatmap'])
-    if df.empty:
-        return go.Figure()
-    
-    # Pivot data for heatmap
-    heatmap_data = df.pivot(index='day_name', columns='hour_of_day', values='click_count')
+    if not has_rows(charts_data, 'usage_heatmap'):
+        return EMPTY_FIGURE
     
-    # Reorder days
+    return build_usage_heatmap_figure(charts_data['usage_heatmap']['data_b64'])
+
+@lru_cache(maxsize=16)
+def build_usage_heatmap_figure(data_b64):
+    """Build the usage heatmap figure for a store payload"""
+    days, hours, click_counts = _cols(
+        data_b64, 'day_of_week_monday_first', 'hour_of_day', 'click_count'
+    )
+    # Missing (day, hour) cells stay zero in the grid
     day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    heatmap_data = heatmap_data.reindex(day_order)
+    heatmap_values = _get_scatter_to_grid()(
+        days.astype(np.int64),
+        hours.astype(np.int64),
+        click_counts.astype(np.int64)
+    )
     
     fig = go.Figure(data=go.Heatmap(
-        z=heatmap_data.values,
-        x=heatmap_data.columns,
-        y=heatmap_data.index,
+        z=heatmap_values,
+        x=list(range(24)),
+        y=day_order,
         colorscale='RdYlGn',
         hovertemplate='Day: %{y}<br>Hour: %{x}<br>Clicks: %{z}<extra></extra>'
     ))
@@ -688,26 +1049,32 @@ def update_usage_heatmap(charts_data):
         margin=dict(l=20, r=20, t=30, b=20)
     )
     
-    return fig
+    return fig.to_plotly_json()
 
 @app.callback(
     Output('user-cohorts-chart', 'figure'),
-    Input('charts-data-store', 'data')
+    Input('charts-data-store', 'data'),
+    prevent_initial_call=True
 )
 def update_user_cohorts_chart(charts_data):
     """Update user cohorts chart"""
-    if not charts_data or 'user_cohorts' not in charts_data:
-        return go.Figure()
-    
-    df = pd.DataFrame(charts_data['user_cohorts'])
-    if df.empty:
-        return go.Figure()
+    if not has_rows(charts_data, 'user_cohorts'):
+        return EMPTY_FIGURE
     
+    return build_user_cohorts_figure(charts_data['user_cohorts']['data_b64'])
+
+@lru_cache(maxsize=16)
+def build_user_cohorts_figure(data_b64):
+    """Build the user cohorts figure for a store payload"""
+    dates, new_users, returning_users = _cols(
+        data_b64, 'activity_date', 'new_users', 'returning_users'
+    )
+    dates = dates.astype('datetime64[ns]')
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=df['activity_date'],
-        y=df['new_users'],
+        x=dates,
+        y=new_users,
         name='New Users',
         stackgroup='one',
         fillcolor=Config.COLORS['primary'],
@@ -715,8 +1082,8 @@ def update_user_cohorts_chart(charts_data):
     ))
     
     fig.add_trace(go.Scatter(
-        x=df['activity_date'],
-        y=df['returning_users'],
+        x=dates,
+        y=returning_users,
         name='Returning Users',
         stackgroup='one',
         fillcolor=Config.COLORS['success'],
@@ -732,67 +1099,72 @@ def update_user_cohorts_chart(charts_data):
         yaxis_title='User Count'
     )
     
-    return fig
+    return fig.to_plotly_json()
 
 @app.callback(
     Output('error-monitoring-chart', 'figure'),
-    Input('charts-data-store', 'data')
+    Output('error-monitoring-resampler', 'data'),
+    Input('charts-data-store', 'data'),
+    prevent_initial_call=True
 )
 def update_error_monitoring_chart(charts_data):
     """Update error monitoring chart"""
-    if not charts_data or 'error_monitoring' not in charts_data:
-        return go.Figure()
+    if not has_rows(charts_data, 'error_monitoring'):
+        return EMPTY_FIGURE, None
     
-    df = pd.DataFrame(charts_data['error_monitoring'])
-    if df.empty:
-        return go.Figure()
+    data_b64 = charts_data['error_monitoring']['data_b64']
+    return show_resampled_figure(
+        'error-monitoring-chart', data_b64, build_error_monitoring_figure(data_b64)
+    )
+
+@lru_cache(maxsize=16)
+def build_error_monitoring_figure(data_b64):
+    """Build the error monitoring figure for a store payload"""
+    dates, successful, failed, error_rate = _cols(
+        data_b64, 'activity_date', 'successful_requests', 'failed_requests', 'error_rate_percentage'
+    )
+    dates = dates.astype('datetime64[ns]')
     
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig = secondary_y_figure("Date", "Request Count", "Error Rate (%)")
     
     fig.add_trace(
         go.Bar(
-            x=df['activity_date'],
-            y=df['successful_requests'],
+            x=dates,
+            y=successful,
             name='Successful Requests',
             marker_color=Config.COLORS['success']
-        ),
-        secondary_y=False
+        )
     )
     
     fig.add_trace(
         go.Bar(
-            x=df['activity_date'],
-            y=df['failed_requests'],
+            x=dates,
+            y=failed,
             name='Failed Requests',
             marker_color=Config.COLORS['danger']
-        ),
-        secondary_y=False
+        )
     )
     
     fig.add_trace(
         go.Scatter(
-            x=df['activity_date'],
-            y=df['error_rate_percentage'],
+            x=dates,
+            y=error_rate,
             name='Error Rate %',
             line=dict(color='#FF4500', width=3),
-            mode='lines+markers'
-        ),
-        secondary_y=True
+            mode='lines+markers',
+            yaxis='y2'
+        )
     )
     
     # Add threshold line
     fig.add_hline(
         y=5,
+        yref='y2',
         line_dash="dash",
         line_color="orange",
-        annotation_text="5% Threshold",
-        secondary_y=True
+        annotation_text="5% Threshold"
     )
     
-    fig.update_xaxes(title_text="Date")
-    fig.update_yaxes(title_text="Request Count", secondary_y=False)
-    fig.update_yaxes(title_text="Error Rate (%)", secondary_y=True)
-    
     fig.update_layout(
         hovermode='x unified',
         template='plotly_white',
@@ -801,54 +1173,67 @@ def update_error_monitoring_chart(charts_data):
         barmode='stack'
     )
     
-    return fig
+    fig = create_resampled_figure(fig)
+    return fig, fig.to_plotly_json()
+
+@app.callback(
+    Output('error-monitoring-chart', 'figure', allow_duplicate=True),
+    Input('error-monitoring-chart', 'relayoutData'),
+    State('error-monitoring-resampler', 'data'),
+    prevent_initial_call=True
+)
+def resample_error_monitoring_chart(relayout_data, resampler_key):
+    """Resample error monitoring traces to the zoomed range"""
+    return resample_figure(resampler_key, relayout_data)
 
 @app.callback(
     Output('user-segmentation-table', 'children'),
-    Input('charts-data-store', 'data')
+    Input('charts-data-store', 'data'),
+    prevent_initial_call=True
 )
 def update_user_segmentation_table(charts_data):
     """Update user segmentation table"""
-    if not charts_data or 'user_segmentation' not in charts_data:
+    if not has_rows(charts_data, 'user_segmentation'):
         return html.Div("No data available")
     
-    df = pd.DataFrame(charts_data['user_segmentation'])
-    if df.empty:
-        return html.Div("No data available")
+    df = decode_frame(charts_data['user_segmentation'])
     
-    # Create table with conditional formatting
-    table = dbc.Table([
-        html.Thead(html.Tr([
-            html.Th("User Email"),
-            html.Th("Segment"),
-            html.Th("Total Clicks"),
-            html.Th("Apps Accessed"),
-            html.Th("Days Active"),
-            html.Th("Avg Clicks/Day")
-        ])),
-        html.Tbody([
-            html.Tr([
-                html.Td(row['user_email']),
-                html.Td(
-                    dbc.Badge(
-                        row['user_segment'],
-                        color={
-                            'Power User': 'primary',
-                            'Active User': 'success',
-                            'Regular User': 'warning',
-                            'Casual User': 'secondary'
-                        }.get(row['user_segment'], 'secondary')
-                    )
-                ),
-                html.Td(f"{row['total_clicks']:,}"),
-                html.Td(f"{row['apps_accessed']}"),
-                html.Td(f"{row['days_active']}"),
-                html.Td(f"{row['avg_clicks_per_day']:.2f}")
-            ]) for _, row in df.head(25).iterrows()
-        ])
-    ], striped=True, bordered=True, hover=True, responsive=True, size='sm')
+    segment_colors = {
+        'Power User': Config.COLORS['primary'],
+        'Active User': Config.COLORS['success'],
+        'Regular User': Config.COLORS['warning'],
+        'Casual User': Config.COLORS['secondary']
+    }
     
-    return table
+    # Rendered client-side; segment colors are applied by filter rules, not per row
+    return dash_table.DataTable(
+        data=df.to_dict('records'),
+        columns=[
+            {'name': 'User Email', 'id': 'user_email'},
+            {'name': 'Segment', 'id': 'user_segment'},
+            {'name': 'Total Clicks', 'id': 'total_clicks', 'type': 'numeric',
+             'format': Format(group=Group.yes)},
+            {'name': 'Apps Accessed', 'id': 'apps_accessed', 'type': 'numeric'},
+            {'name': 'Days Active', 'id': 'days_active', 'type': 'numeric'},
+            {'name': 'Avg Clicks/Day', 'id': 'avg_clicks_per_day', 'type': 'numeric',
+             'format': Format(precision=2, scheme=Scheme.fixed)}
+        ],
+        virtualization=True,
+        page_size=25,
+        style_table={'overflowX': 'auto'},
+        style_header={'fontWeight': 'bold', 'backgroundColor': Config.COLORS['background']},
+        style_cell={'textAlign': 'left', 'fontSize': '0.875rem', 'padding': '4px 8px'},
+        style_data_conditional=[
+            {'if': {'row_index': 'odd'}, 'backgroundColor': Config.COLORS['background']}
+        ] + [
+            {
+                'if': {'filter_query': f'{{user_segment}} = "{segment}"', 'column_id': 'user_segment'},
+                'color': color,
+                'fontWeight': 'bold'
+            }
+            for segment, color in segment_colors.items()
+        ]
+    )
 
 # ====================================================================
 # RUN APP
@@ -13,19 +13,39 @@ Updated: 2025-12-07
 """
 
 import dash
-from dash import dcc, html, Input, Output, State, callback
+from dash import dcc, html, Input, Output, State, MATCH, callback
 import dash_bootstrap_components as dbc
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import pandas as pd
-from datetime import datetime, timedelta
+import plotly.io as pio
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from datetime import date, datetime, timedelta
 import numpy as np
-from databricks import sql
 from databricks.sdk.core import Config as DBConfig
 import os
+import copy
 import yaml
+import base64
+import hashlib
+import queue
+import time
 from pathlib import Path
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+from functools import lru_cache, wraps
+from threading import Event, Lock
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cachetools import LRUCache, TTLCache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# libyaml-backed loader when PyYAML was built with it; pure Python otherwise
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 # ====================================================================
 # ENVIRONMENT VALIDATION (same as original working app)
@@ -46,6 +66,28 @@ print(f"  Schema: {SCHEMA}")
 # CONFIGURATION
 # ====================================================================
 
+# Parsed YAML by path, reused while the file's (mtime, size) is unchanged
+_YAML_CACHE = OrderedDict()  # path -> (mtime, size, parsed)
+_YAML_CACHE_MAX = 100
+
+
+def _load_yaml_cached(config_path):
+    """Parse a YAML file, skipping the parse when it has not changed"""
+    stat = config_path.stat()
+    key = str(config_path)
+    cached = _YAML_CACHE.get(key)
+    if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+        _YAML_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+
+    with open(config_path, 'r') as f:
+        parsed = yaml.load(f, Loader=SafeLoader)
+    _YAML_CACHE[key] = (stat.st_mtime, stat.st_size, parsed)
+    if len(_YAML_CACHE) > _YAML_CACHE_MAX:
+        _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(parsed)
+
+
 def load_dashboard_config():
     """Load dashboard configuration from YAML file"""
     config_paths = [
@@ -57,8 +99,7 @@ def load_dashboard_config():
     for config_path in config_paths:
         if config_path.exists():
             try:
-                with open(config_path, 'r') as f:
-                    return yaml.safe_load(f)
+                return _load_yaml_cached(config_path)
             except Exception as e:
                 print(f"Error loading config from {config_path}: {e}")
 
@@ -71,8 +112,39 @@ def load_dashboard_config():
         'workspace': {'workspace_id': '1602460480284688', 'warehouse_id': '4b28691c780d9875'}
     }
 
+def _resolve_dashboard(dashboard_key, dashboard_config):
+    """Effective settings for one embedded dashboard, with the *_URL env override applied"""
+    config_url = dashboard_config.get('url', '')
+    return {
+        'name': dashboard_config.get('name', dashboard_key.replace('_', ' ').title()),
+        'description': dashboard_config.get('description', ''),
+        'icon': dashboard_config.get('icon', 'bar-chart-line'),
+        'url': os.getenv(f"{dashboard_key.upper()}_URL", config_url),
+        'external_url': dashboard_config.get('external_url', config_url),
+        'height': dashboard_config.get('height', 800),
+        'background': dashboard_config.get('background', '#FFFFFF'),
+        'enabled': dashboard_config.get('enabled', False),
+    }
+
+
+def resolve_dashboards(config):
+    """Resolved embedded-dashboard settings by key"""
+    return {
+        key: _resolve_dashboard(key, dashboard_config)
+        for key, dashboard_config in config.get('dashboards', {}).items()
+    }
+
+
+def reload_dashboard_config():
+    """Re-read dashboard_config.yaml and the *_URL overrides (e.g. after editing them)"""
+    global DASHBOARD_CONFIG, RESOLVED_DASHBOARDS
+    DASHBOARD_CONFIG = load_dashboard_config()
+    RESOLVED_DASHBOARDS = resolve_dashboards(DASHBOARD_CONFIG)
+
+
 # Load configuration at startup
 DASHBOARD_CONFIG = load_dashboard_config()
+RESOLVED_DASHBOARDS = resolve_dashboards(DASHBOARD_CONFIG)
 
 
 class AppConfig:
@@ -89,12 +161,19 @@ class AppConfig:
     ANALYTICS_CATALOG = os.getenv('ANALYTICS_CATALOG', 'hls_amer_catalog')
     ANALYTICS_SCHEMA = os.getenv('ANALYTICS_SCHEMA', 'apps_telemetry')
 
+    # Read trend queries from the daily_agg rollup; opt-in, because the table
+    # only exists once deployment/create_daily_agg.sh has run
+    USE_DAILY_AGG = os.getenv('USE_DAILY_AGG', 'false').lower() == 'true'
+
     # Workspace filter
     WORKSPACE_ID = DASHBOARD_CONFIG.get('workspace', {}).get('workspace_id', '1602460480284688')
 
     # Default date ranges
     DEFAULT_DAYS_BACK = 30
 
+    # Trend series longer than this are downsampled before reaching the browser
+    MAX_TREND_POINTS = 500
+
     # Refresh intervals (in milliseconds)
     REFRESH_INTERVAL = DASHBOARD_CONFIG.get('refresh', {}).get('interval_ms', 300000)
 
@@ -155,328 +234,208 @@ class AppConfig:
 
 
 # ====================================================================
-# CUSTOM CSS STYLES
+# DATABASE CONNECTION - Using same pattern as working original app
 # ====================================================================
 
-CUSTOM_CSS = """
-/* ================================================================
-   HLS EXECUTIVE DASHBOARD THEME
-   ================================================================ */
-
-/* Global Styles */
-body {
-    background-color: #F8FAFC;
-    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-}
-
-/* Navbar Styling */
-.navbar-executive {
-    background: linear-gradient(135deg, #1B3A57 0%, #2E5780 100%) !important;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.15);
-    padding: 0.75rem 1rem;
-}
-
-.navbar-brand-text {
-    font-size: 1.5rem;
-    font-weight: 700;
-    color: #FFFFFF !important;
-    letter-spacing: -0.5px;
-}
-
-.navbar-subtitle {
-    font-size: 0.75rem;
-    color: rgba(255,255,255,0.7);
-    margin-left: 1rem;
-}
-
-/* Tab Navigation */
-.nav-tabs-executive {
-    border-bottom: 2px solid #E2E8F0;
-    background: #FFFFFF;
-    padding: 0 1rem;
-    border-radius: 12px 12px 0 0;
-    box-shadow: 0 -2px 10px rgba(0,0,0,0.03);
-}
-
-.nav-tabs-executive .nav-link {
-    color: #64748B;
-    border: none;
-    border-bottom: 3px solid transparent;
-    padding: 1rem 1.5rem;
-    font-weight: 600;
-    font-size: 0.9rem;
-    transition: all 0.2s ease;
-    margin-bottom: -2px;
-}
-
-.nav-tabs-executive .nav-link:hover {
-    color: #1B3A57;
-    border-bottom-color: #E2E8F0;
-    background: transparent;
-}
-
-.nav-tabs-executive .nav-link.active {
-    color: #FF3621 !important;
-    border-bottom-color: #FF3621 !important;
-    background: transparent !important;
-}
-
-/* Executive KPI Cards */
-.kpi-card-executive {
-    border: none;
-    border-radius: 16px;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.08), 0 4px 12px rgba(0,0,0,0.04);
-    transition: transform 0.2s ease, box-shadow 0.2s ease;
-    overflow: hidden;
-    background: #FFFFFF;
-}
-
-.kpi-card-executive:hover {
-    transform: translateY(-4px);
-    box-shadow: 0 4px 12px rgba(0,0,0,0.12), 0 8px 24px rgba(0,0,0,0.08);
-}
-
-.kpi-card-executive .card-body {
-    padding: 1.25rem;
-}
-
-.kpi-icon-container {
-    width: 48px;
-    height: 48px;
-    border-radius: 12px;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    margin-bottom: 0.75rem;
-}
-
-.kpi-value {
-    font-size: 1.75rem;
-    font-weight: 700;
-    color: #0F172A;
-    line-height: 1.2;
-    margin-bottom: 0.25rem;
-}
+# Initialize Databricks SDK config (same as original working app)
+cfg = DBConfig()
+# Bound once; the SDK refreshes the token behind this header factory itself
+_AUTH = cfg.authenticate
 
-.kpi-label {
-    font-size: 0.8rem;
-    color: #64748B;
-    text-transform: uppercase;
-    letter-spacing: 0.05em;
-    font-weight: 500;
-}
 
-.kpi-change {
-    font-size: 0.75rem;
-    font-weight: 600;
-    padding: 2px 8px;
-    border-radius: 12px;
-    margin-top: 0.5rem;
-    display: inline-block;
-}
+def _credentials_provider():
+    """Credentials provider shared by every pooled connection"""
+    return _AUTH
 
-.kpi-change-positive {
-    background: rgba(0, 166, 126, 0.1);
-    color: #00A67E;
-}
 
-.kpi-change-negative {
-    background: rgba(220, 53, 69, 0.1);
-    color: #DC3545;
-}
+# Query results are reused for one refresh interval; the audit data only
+# turns over daily, so repeat callbacks inside the window skip the warehouse
+QUERY_CACHE_TTL = AppConfig.REFRESH_INTERVAL / 1000
+_QUERY_CACHE = TTLCache(maxsize=128, ttl=QUERY_CACHE_TTL)
+_QUERY_CACHE_LOCK = Lock()
+_PENDING_QUERIES = {}  # cache key -> Event set when the in-flight run finishes
 
-.kpi-change-neutral {
-    background: rgba(100, 116, 139, 0.1);
-    color: #64748B;
-}
 
-/* Section Headers */
-.section-header {
-    font-size: 1.1rem;
-    font-weight: 700;
-    color: #1B3A57;
-    margin-bottom: 1rem;
-    display: flex;
-    align-items: center;
-}
+# Query results also persist as parquet, one file per query per day, so they
+# survive worker restarts and deploys; a file is only served while it is
+# younger than the in-memory TTL, and files from earlier days are purged
+QUERY_CACHE_DIR = Path(os.getenv('QUERY_CACHE_DIR', '.cache'))
 
-.section-header::before {
-    content: '';
-    width: 4px;
-    height: 20px;
-    background: #FF3621;
-    border-radius: 2px;
-    margin-right: 0.75rem;
-}
 
-/* Chart Cards */
-.chart-card {
-    background: #FFFFFF;
-    border: none;
-    border-radius: 16px;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.06), 0 2px 8px rgba(0,0,0,0.04);
-    overflow: hidden;
-}
+def _disk_cache_path(key: str) -> Path:
+    return QUERY_CACHE_DIR / f"{key}-{date.today().isoformat()}.parquet"
 
-.chart-card .card-header {
-    background: transparent;
-    border-bottom: 1px solid #E2E8F0;
-    padding: 1rem 1.25rem;
-}
 
-.chart-card .card-title {
-    font-size: 1rem;
-    font-weight: 600;
-    color: #1B3A57;
-    margin-bottom: 0;
-}
+def _read_disk_cache(key: str):
+    """Cached result for a query key written within the last TTL, or None"""
+    path = _disk_cache_path(key)
+    try:
+        if time.time() - path.stat().st_mtime > QUERY_CACHE_TTL:
+            return None
+    except FileNotFoundError:
+        return None
+    try:
+        return pq.read_table(path)
+    except Exception as e:
+        print(f"Ignoring unreadable cache file {path}: {e}")
+        return None
 
-.chart-card .card-subtitle {
-    font-size: 0.8rem;
-    color: #64748B;
-}
 
-/* Data Tables */
-.table-executive {
-    font-size: 0.875rem;
-}
+def _write_disk_cache(key: str, table: pa.Table):
+    """Persist a query result and drop cache files from previous days"""
+    path = _disk_cache_path(key)
+    try:
+        QUERY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+        today = date.today().isoformat()
+        for stale in QUERY_CACHE_DIR.glob('*.parquet'):
+            if not stale.stem.endswith(today):
+                stale.unlink(missing_ok=True)
+    except Exception as e:
+        print(f"Could not write cache file {path}: {e}")
 
-.table-executive thead th {
-    background: #F8FAFC;
-    color: #1B3A57;
-    font-weight: 600;
-    text-transform: uppercase;
-    font-size: 0.75rem;
-    letter-spacing: 0.05em;
-    padding: 0.875rem 1rem;
-    border-bottom: 2px solid #E2E8F0;
-}
 
-.table-executive tbody td {
-    padding: 0.75rem 1rem;
-    vertical-align: middle;
-    border-bottom: 1px solid #F1F5F9;
-}
+class ArrowResult:
+    """Query result kept as a pyarrow Table; pandas conversion happens on demand"""
 
-.table-executive tbody tr:hover {
-    background: #F8FAFC;
-}
+    def __init__(self, table: pa.Table):
+        self.table = table
+        self._df = None
 
-/* Segment Badges */
-.segment-badge {
-    font-size: 0.7rem;
-    font-weight: 600;
-    padding: 4px 10px;
-    border-radius: 20px;
-    text-transform: uppercase;
-    letter-spacing: 0.03em;
-}
+    @property
+    def empty(self) -> bool:
+        return self.table.num_rows == 0
 
-.segment-power {
-    background: linear-gradient(135deg, #FF3621 0%, #FF6B5C 100%);
-    color: white;
-}
+    def column(self, name: str) -> np.ndarray:
+        """Single column as a numpy array, without building a DataFrame"""
+        return self.table.column(name).to_numpy()
 
-.segment-active {
-    background: linear-gradient(135deg, #00A67E 0%, #14B8A6 100%);
-    color: white;
-}
+    def to_pylist(self) -> list:
+        """Rows as a list of dicts (dcc.Store records)"""
+        return self.table.to_pylist()
 
-.segment-regular {
-    background: linear-gradient(135deg, #F5A623 0%, #F97316 100%);
-    color: white;
-}
+    def to_pandas(self) -> 'pd.DataFrame':
+        """Arrow-backed DataFrame sharing the table's buffers (no NumPy copy).
 
-.segment-casual {
-    background: #E2E8F0;
-    color: #64748B;
-}
+        The table stays cached for other readers, so it is not self-destructed.
+        """
+        if self._df is None:
+            import pandas as pd
+            self._df = self.table.to_pandas(types_mapper=pd.ArrowDtype)
+        return self._df
 
-/* Filter Controls */
-.filter-card {
-    background: #FFFFFF;
-    border: none;
-    border-radius: 12px;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-    padding: 1rem 1.5rem;
-    margin-bottom: 1.5rem;
-}
 
-.filter-label {
-    font-size: 0.75rem;
-    font-weight: 600;
-    color: #64748B;
-    text-transform: uppercase;
-    letter-spacing: 0.05em;
-    margin-bottom: 0.5rem;
-}
+def _query_cache_key(query: str, params: dict = None) -> str:
+    """Cache key for a SQL statement and its parameters, insensitive to whitespace"""
+    key = ' '.join(query.split())
+    if params:
+        key += repr(sorted(params.items()))
+    return hashlib.sha1(key.encode()).hexdigest()
 
-/* Status Indicators */
-.status-dot {
-    width: 8px;
-    height: 8px;
-    border-radius: 50%;
-    display: inline-block;
-    margin-right: 6px;
-}
 
-.status-healthy { background: #00A67E; }
-.status-warning { background: #F5A623; }
-.status-critical { background: #DC3545; }
+def sql_query(query: str, params: dict = None, force_refresh: bool = False) -> ArrowResult:
+    """Execute a SQL query and return the result as an ArrowResult, or None
+    if the query failed.
+    Results are cached per query; concurrent callers of the same query wait
+    for the in-flight execution instead of each hitting the warehouse.
+    """
+    key = _query_cache_key(query, params)
+
+    while True:
+        with _QUERY_CACHE_LOCK:
+            if not force_refresh and key in _QUERY_CACHE:
+                return _QUERY_CACHE[key]
+            pending = _PENDING_QUERIES.get(key)
+            if pending is None:
+                pending = _PENDING_QUERIES[key] = Event()
+                break
+        # Another callback is already running this query; reuse its result
+        pending.wait()
+        force_refresh = False
 
-/* Loading Spinner */
-.dash-spinner {
-    color: #FF3621 !important;
-}
+    try:
+        # Restarted workers warm up from results another process wrote this interval
+        table = None if force_refresh else _read_disk_cache(key)
+        if table is None:
+            table = _run_sql_query(query, params)
+            if table is None:
+                return None
+            if table.num_rows:
+                _write_disk_cache(key, table)
+        result = ArrowResult(table)
+        if not result.empty:
+            with _QUERY_CACHE_LOCK:
+                _QUERY_CACHE[key] = result
+        return result
+    finally:
+        with _QUERY_CACHE_LOCK:
+            del _PENDING_QUERIES[key]
+        pending.set()
+
+
+# Warehouse connections are reused across queries; each slot holds an open
+# connection or None until first use, so startup does not wait on the handshake.
+# LIFO keeps the most recently used (warm) connection in rotation
+_POOL_SIZE = int(os.getenv('DATABRICKS_POOL_SIZE', '8'))
+QUERY_WORKERS = _POOL_SIZE  # concurrent queries per dashboard fetch
+# Shared by every fetch so callbacks do not spin up threads per refresh
+_QUERY_EXECUTOR = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix='telemetry-query')
+_POOL = queue.LifoQueue(maxsize=_POOL_SIZE)
+for _ in range(_POOL_SIZE):
+    _POOL.put(None)
+
+
+def _open_connection():
+    """Open a warehouse connection (same pattern as the original working app)"""
+    from databricks import sql
+
+    return sql.connect(
+        server_hostname=cfg.host,
+        http_path=f"/sql/1.0/warehouses/{os.getenv('DATABRICKS_WAREHOUSE_ID')}",
+        credentials_provider=_credentials_provider
+    )
 
-/* Footer */
-.dashboard-footer {
-    background: #F8FAFC;
-    border-top: 1px solid #E2E8F0;
-    padding: 1rem 0;
-    margin-top: 2rem;
-    font-size: 0.8rem;
-    color: #64748B;
-}
 
-/* Responsive adjustments */
-@media (max-width: 768px) {
-    .kpi-value {
-        font-size: 1.5rem;
-    }
+def _close_connection(connection):
+    """Close a connection, ignoring errors from an already-dead session"""
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            pass
 
-    .nav-tabs-executive .nav-link {
-        padding: 0.75rem 1rem;
-        font-size: 0.8rem;
-    }
-}
-"""
 
-# ====================================================================
-# DATABASE CONNECTION - Using same pattern as working original app
-# ====================================================================
-
-# Initialize Databricks SDK config (same as original working app)
-cfg = DBConfig()
-
-def sql_query(query: str) -> pd.DataFrame:
-    """Execute a SQL query and return result as pandas DataFrame.
-    Uses the exact same pattern as the original working app.
+def _run_sql_query(query: str, params: dict = None) -> pa.Table:
+    """Execute a SQL query on a pooled warehouse connection, returning None
+    on failure. A connection that fails at the transport level is replaced
+    and the query retried once.
     """
+    from databricks import sql
+
+    connection = _POOL.get()
     try:
-        with sql.connect(
-            server_hostname=cfg.host,
-            http_path=f"/sql/1.0/warehouses/{os.getenv('DATABRICKS_WAREHOUSE_ID')}",
-            credentials_provider=lambda: cfg.authenticate
-        ) as connection:
-            with connection.cursor() as cursor:
-                cursor.execute(query)
-                return cursor.fetchall_arrow().to_pandas()
-    except Exception as e:
-        print(f"Query failed: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return pd.DataFrame()
+        for attempt in range(2):
+            try:
+                if connection is None:
+                    connection = _open_connection()
+                with connection.cursor() as cursor:
+                    cursor.execute(query, params)
+                    return cursor.fetchall_arrow()
+            except (sql.exc.OperationalError, sql.exc.InterfaceError) as e:
+                print(f"Connection error (attempt {attempt + 1}): {str(e)}")
+                _close_connection(connection)
+                connection = None
+            except Exception as e:
+                print(f"Query failed: {str(e)}")
+                import traceback
+                traceback.print_exc()
+                break
+        return None
+    finally:
+        _POOL.put(connection)
 
 
 class DatabricksConnection:
@@ -485,110 +444,177 @@ class DatabricksConnection:
     def __init__(self):
         self.connection = None
 
-    def execute_query(self, query):
+    def execute_query(self, query, params=None, force_refresh=False):
         """Execute SQL query using the simple sql_query function"""
-        return sql_query(query)
+        return sql_query(query, params, force_refresh=force_refresh)
 
     def connect(self):
-        """Connection is handled per-query in sql_query function"""
-        return True
+        """Make sure the pool holds an open connection (opening one if needed).
+        The connection stays pooled, so the next query reuses the handshake.
+        Never waits for a slot: raises queue.Empty while every slot is in use.
+        """
+        connection = _POOL.get_nowait()
+        try:
+            if connection is None or not getattr(connection, 'open', True):
+                _close_connection(connection)
+                connection = None
+                connection = _open_connection()
+            return True
+        finally:
+            _POOL.put(connection)
 
     def close(self):
-        """Connection is handled per-query, nothing to close"""
-        pass
+        """Close all idle pooled connections"""
+        connections = [_POOL.get() for _ in range(_POOL_SIZE)]
+        for connection in connections:
+            _close_connection(connection)
+            _POOL.put(None)
 
 # Initialize connection wrapper
 db_conn = DatabricksConnection()
 
+# Last connection probe ('connected' or 'disconnected'); the header status
+# reuses it for PROBE_INTERVAL seconds
+PROBE_INTERVAL = 60
+_LAST_PROBE = {'t': 0.0, 'status': None}
+
+
+def connection_status():
+    """'connected', 'disconnected', or 'busy' while every pooled connection is
+    running a query. Probed at most once per PROBE_INTERVAL, without waiting
+    for a pool slot.
+    """
+    from databricks import sql
+
+    now = time.monotonic()
+    if _LAST_PROBE['status'] is None or now - _LAST_PROBE['t'] >= PROBE_INTERVAL:
+        try:
+            db_conn.connect()
+            status = 'connected'
+        except queue.Empty:
+            # Not cached, so the next tick probes again once a slot frees up
+            return 'busy'
+        except (sql.exc.OperationalError, sql.exc.InterfaceError) as e:
+            print(f"Connection probe failed: {e}")
+            status = 'disconnected'
+        _LAST_PROBE.update(t=now, status=status)
+    return _LAST_PROBE['status']
+
 # ====================================================================
 # DATA QUERIES - Enhanced with Leadership Metrics
 # ====================================================================
 
+def _days(n) -> int:
+    """Validate a day-count query argument and normalize it to int"""
+    n = int(n)
+    if not 1 <= n <= 365:
+        raise ValueError(f"Day range out of bounds: {n}")
+    return n
+
+
 class DataQueries:
-    """SQL queries for dashboard data including executive metrics"""
+    """SQL queries for dashboard data including executive metrics
 
-    WORKSPACE_FILTER = f"AND workspace_id = '{AppConfig.WORKSPACE_ID}'"
+    Each query returns (sql, params); date windows, row limits, the
+    workspace id and the DBU rate are bound as named parameters so the
+    statement text is the same for every range and deployment.
+    Builders are memoized, so the SQL for a given range is formatted once.
+    """
 
-    # ================================================================
-    # CORE TELEMETRY QUERIES
-    # ================================================================
+    WORKSPACE_FILTER = "AND workspace_id = :workspace_id"
+
+    # Nightly rollup maintained by deployment/create_daily_agg.sh
+    DAILY_AGG = f"{AppConfig.ANALYTICS_CATALOG}.{AppConfig.ANALYTICS_SCHEMA}.daily_agg"
 
     @staticmethod
-    def get_kpi_summary(days_back=30):
-        return f"""
-        WITH current_period AS (
+    def daily_source(window):
+        """Per-(day, hour, app, user) rows for the last `window` days.
+
+        With USE_DAILY_AGG, days up to the latest one in the daily_agg rollup
+        come from the rollup and every later day (today, plus any day the
+        nightly job has not yet written) is aggregated from the raw audit
+        log; otherwise every day is aggregated from the raw audit log.
+        """
+        raw = f"""
             SELECT
-                COUNT(DISTINCT user_identity.email) AS total_unique_users,
-                COUNT(DISTINCT request_params.app_id) AS total_unique_apps,
-                COUNT(*) AS total_interactions,
-                ROUND(COUNT(*) * 1.0 / NULLIF(COUNT(DISTINCT user_identity.email), 0), 2) AS avg_interactions_per_user,
-                ROUND(SUM(CASE WHEN response.status_code >= 400 OR response.error_message IS NOT NULL THEN 1 ELSE 0 END) * 100.0 / NULLIF(COUNT(*), 0), 2) AS overall_error_rate
+                DATE(event_time) AS activity_date,
+                HOUR(event_time) AS hour_of_day,
+                request_params.app_id AS app_id,
+                COALESCE(request_params.app_name, request_params.app_id, 'Unknown App') AS app_name,
+                user_identity.email AS user_email,
+                COUNT(*) AS click_count,
+                COUNT_IF(response.status_code >= 400) AS http_error_count
             FROM system.access.audit
             WHERE service_name = 'apps'
-                AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-                AND event_date < CURRENT_DATE
+                AND event_date >= DATE_SUB(CURRENT_DATE, {window})"""
+        if not AppConfig.USE_DAILY_AGG:
+            return f"""({raw}
                 {DataQueries.WORKSPACE_FILTER}
-        ),
-        previous_period AS (
-            SELECT
-                COUNT(DISTINCT user_identity.email) AS prev_users,
-                COUNT(*) AS prev_interactions
-            FROM system.access.audit
-            WHERE service_name = 'apps'
-                AND event_date >= CURRENT_DATE - INTERVAL '{days_back * 2}' DAY
-                AND event_date < CURRENT_DATE - INTERVAL '{days_back}' DAY
+            GROUP BY ALL
+        )"""
+        return f"""(
+            SELECT activity_date, hour_of_day, app_id, app_name, user_email, click_count, http_error_count
+            FROM {DataQueries.DAILY_AGG}
+            WHERE activity_date >= DATE_SUB(CURRENT_DATE, {window})
                 {DataQueries.WORKSPACE_FILTER}
-        )
-        SELECT
-            c.*,
-            p.prev_users,
-            p.prev_interactions,
-            ROUND((c.total_unique_users - p.prev_users) * 100.0 / NULLIF(p.prev_users, 0), 1) AS user_growth_pct,
-            ROUND((c.total_interactions - p.prev_interactions) * 100.0 / NULLIF(p.prev_interactions, 0), 1) AS interaction_growth_pct
-        FROM current_period c
-        CROSS JOIN previous_period p
-        """
+            UNION ALL{raw}
+                AND event_date > (
+                    SELECT COALESCE(MAX(activity_date), DATE'1970-01-01')
+                    FROM {DataQueries.DAILY_AGG}
+                    WHERE activity_date >= DATE_SUB(CURRENT_DATE, {window})
+                        {DataQueries.WORKSPACE_FILTER}
+                )
+                {DataQueries.WORKSPACE_FILTER}
+            GROUP BY ALL
+        )"""
+
+    # ================================================================
+    # CORE TELEMETRY QUERIES
+    # ================================================================
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_dau_trend(days_back=90):
+        days_back = _days(days_back)
         return f"""
+        WITH daily AS {DataQueries.daily_source(':days_back')}
         SELECT
-            DATE(event_time) AS activity_date,
-            COUNT(DISTINCT user_identity.email) AS daily_active_users,
-            COUNT(*) AS total_clicks,
-            COUNT(DISTINCT request_params.app_id) AS apps_accessed
-        FROM system.access.audit
-        WHERE service_name = 'apps'
-            AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-            {DataQueries.WORKSPACE_FILTER}
-        GROUP BY DATE(event_time)
+            activity_date,
+            COUNT(DISTINCT user_email) AS daily_active_users,
+            SUM(click_count) AS total_clicks,
+            COUNT(DISTINCT app_id) AS apps_accessed
+        FROM daily
+        GROUP BY activity_date
         ORDER BY activity_date ASC
-        """
+        """, {'days_back': days_back, 'workspace_id': AppConfig.WORKSPACE_ID}
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_top_apps(days_back=30, limit=10):
+        days_back = _days(days_back)
         return f"""
+        WITH daily AS {DataQueries.daily_source(':days_back')}
         SELECT
-            COALESCE(request_params.app_name, request_params.app_id, 'Unknown App') AS app_name,
-            COUNT(*) AS click_count,
-            COUNT(DISTINCT user_identity.email) AS unique_users,
-            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) AS percentage_of_total,
-            COUNT(DISTINCT DATE(event_time)) AS active_days
-        FROM system.access.audit
-        WHERE service_name = 'apps'
-            AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-            {DataQueries.WORKSPACE_FILTER}
-        GROUP BY COALESCE(request_params.app_name, request_params.app_id, 'Unknown App')
+            app_name,
+            SUM(click_count) AS click_count,
+            COUNT(DISTINCT user_email) AS unique_users,
+            ROUND(SUM(click_count) * 100.0 / SUM(SUM(click_count)) OVER (), 2) AS percentage_of_total,
+            COUNT(DISTINCT activity_date) AS active_days
+        FROM daily
+        GROUP BY app_name
         ORDER BY click_count DESC
-        LIMIT {limit}
-        """
+        LIMIT :limit
+        """, {'days_back': days_back, 'workspace_id': AppConfig.WORKSPACE_ID, 'limit': int(limit)}
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_usage_heatmap(days_back=30):
+        days_back = _days(days_back)
         return f"""
+        WITH daily AS {DataQueries.daily_source(':days_back')}
         SELECT
-            DAYOFWEEK(event_time) AS day_of_week,
-            CASE DAYOFWEEK(event_time)
+            DAYOFWEEK(activity_date) AS day_of_week,
+            CASE DAYOFWEEK(activity_date)
                 WHEN 1 THEN 'Sunday'
                 WHEN 2 THEN 'Monday'
                 WHEN 3 THEN 'Tuesday'
@@ -597,18 +623,17 @@ class DataQueries:
                 WHEN 6 THEN 'Friday'
                 WHEN 7 THEN 'Saturday'
             END AS day_name,
-            HOUR(event_time) AS hour_of_day,
-            COUNT(*) AS click_count
-        FROM system.access.audit
-        WHERE service_name = 'apps'
-            AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-            {DataQueries.WORKSPACE_FILTER}
-        GROUP BY DAYOFWEEK(event_time), day_name, HOUR(event_time)
+            hour_of_day,
+            SUM(click_count) AS click_count
+        FROM daily
+        GROUP BY DAYOFWEEK(activity_date), day_name, hour_of_day
         ORDER BY day_of_week, hour_of_day
-        """
+        """, {'days_back': days_back, 'workspace_id': AppConfig.WORKSPACE_ID}
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_user_cohorts(days_back=30):
+        days_back = _days(days_back)
         return f"""
         WITH user_first_interaction AS (
             SELECT
@@ -627,14 +652,16 @@ class DataQueries:
         FROM system.access.audit a
         JOIN user_first_interaction ufi ON a.user_identity.email = ufi.email
         WHERE a.service_name = 'apps'
-            AND a.event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-            {DataQueries.WORKSPACE_FILTER.replace('AND', 'AND a.')}
+            AND a.event_date >= DATE_SUB(CURRENT_DATE, :days_back)
+            AND a.workspace_id = :workspace_id
         GROUP BY DATE(a.event_time)
         ORDER BY activity_date ASC
-        """
+        """, {'days_back': days_back, 'workspace_id': AppConfig.WORKSPACE_ID}
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_error_monitoring(days_back=30):
+        days_back = _days(days_back)
         return f"""
         SELECT
             DATE(event_time) AS activity_date,
@@ -644,14 +671,16 @@ class DataQueries:
             ROUND(SUM(CASE WHEN response.status_code >= 400 OR response.error_message IS NOT NULL THEN 1 ELSE 0 END) * 100.0 / NULLIF(COUNT(*), 0), 2) AS error_rate_percentage
         FROM system.access.audit
         WHERE service_name = 'apps'
-            AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
+            AND event_date >= DATE_SUB(CURRENT_DATE, :days_back)
             {DataQueries.WORKSPACE_FILTER}
         GROUP BY DATE(event_time)
         ORDER BY activity_date ASC
-        """
+        """, {'days_back': days_back, 'workspace_id': AppConfig.WORKSPACE_ID}
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_user_segmentation(days_back=30, limit=100):
+        days_back = _days(days_back)
         return f"""
         SELECT
             user_identity.email AS user_email,
@@ -659,94 +688,126 @@ class DataQueries:
             COUNT(*) AS total_clicks,
             COUNT(DISTINCT DATE(event_time)) AS days_active,
             ROUND(COUNT(*) * 1.0 / NULLIF(COUNT(DISTINCT DATE(event_time)), 0), 2) AS avg_clicks_per_day,
-            MAX(event_time) AS last_interaction,
-            CASE
-                WHEN COUNT(*) >= 100 THEN 'Power User'
-                WHEN COUNT(*) >= 50 THEN 'Active User'
-                WHEN COUNT(*) >= 10 THEN 'Regular User'
-                ELSE 'Casual User'
-            END AS user_segment
+            MAX(event_time) AS last_interaction
         FROM system.access.audit
         WHERE service_name = 'apps'
-            AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
+            AND event_date >= DATE_SUB(CURRENT_DATE, :days_back)
             {DataQueries.WORKSPACE_FILTER}
         GROUP BY user_identity.email
         ORDER BY total_clicks DESC
-        LIMIT {limit}
-        """
+        LIMIT :limit
+        """, {'days_back': days_back, 'workspace_id': AppConfig.WORKSPACE_ID, 'limit': int(limit)}
 
     # ================================================================
     # EXECUTIVE/LEADERSHIP METRICS QUERIES
     # ================================================================
 
     @staticmethod
-    def get_executive_summary(days_back=30):
-        """High-level metrics for executive view"""
+    @lru_cache(maxsize=32)
+    def get_all_summary(days_back=30):
+        """KPI, executive and cost summary in one statement.
+
+        The audit table is scanned once (two windows back, for the growth
+        comparison) and the current/previous periods are split with FILTER
+        aggregates in a single pass over it.
+        """
+        days_back = _days(days_back)
         return f"""
-        WITH metrics AS (
+        WITH base AS (
             SELECT
-                COUNT(DISTINCT user_identity.email) AS total_users,
-                COUNT(DISTINCT request_params.app_id) AS total_apps,
-                COUNT(*) AS total_interactions,
-                SUM(CASE WHEN response.status_code >= 400 THEN 1 ELSE 0 END) AS total_errors,
-                COUNT(DISTINCT DATE(event_time)) AS active_days
+                user_identity.email AS email,
+                request_params.app_id AS app_id,
+                event_date,
+                event_date >= DATE_SUB(CURRENT_DATE, :days_back) AS is_current,
+                response.status_code >= 400 AS is_http_error,
+                response.status_code >= 400 OR response.error_message IS NOT NULL AS is_failed
             FROM system.access.audit
             WHERE service_name = 'apps'
-                AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
+                AND event_date >= DATE_SUB(CURRENT_DATE, :days_back * 2)
                 {DataQueries.WORKSPACE_FILTER}
         ),
+        audit AS (
+            SELECT
+                COUNT(DISTINCT email) FILTER (WHERE is_current AND event_date < CURRENT_DATE) AS total_unique_users,
+                COUNT(DISTINCT app_id) FILTER (WHERE is_current AND event_date < CURRENT_DATE) AS total_unique_apps,
+                COUNT(*) FILTER (WHERE is_current AND event_date < CURRENT_DATE) AS total_interactions,
+                COUNT(*) FILTER (WHERE is_current AND event_date < CURRENT_DATE AND is_failed) AS failed_interactions,
+                COUNT(DISTINCT email) FILTER (WHERE NOT is_current) AS prev_users,
+                COUNT(*) FILTER (WHERE NOT is_current) AS prev_interactions,
+                COUNT(DISTINCT email) FILTER (WHERE is_current) AS total_users,
+                COUNT(DISTINCT app_id) FILTER (WHERE is_current) AS total_apps,
+                COUNT(*) FILTER (WHERE is_current AND is_http_error) AS total_errors,
+                COUNT(DISTINCT event_date) FILTER (WHERE is_current) AS active_days,
+                COUNT(*) FILTER (WHERE is_current) AS window_interactions
+            FROM base
+        ),
         power_users AS (
-            SELECT COUNT(DISTINCT user_identity.email) AS power_user_count
-            FROM system.access.audit
-            WHERE service_name = 'apps'
-                AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-                {DataQueries.WORKSPACE_FILTER}
-            GROUP BY user_identity.email
-            HAVING COUNT(*) >= 100
+            SELECT COUNT(*) AS power_user_count
+            FROM (
+                SELECT email
+                FROM base
+                WHERE is_current
+                GROUP BY email
+                HAVING COUNT(*) >= 100
+            )
+        ),
+        cost AS (
+            SELECT
+                SUM(usage_quantity) AS total_dbus,
+                ROUND(SUM(usage_quantity) * :dbu_cost_rate, 2) AS total_cost_usd,
+                COUNT(DISTINCT usage_metadata.app_name) AS apps_with_cost,
+                ROUND(AVG(usage_quantity), 2) AS avg_daily_dbus
+            FROM system.billing.usage
+            WHERE usage_date >= DATE_SUB(CURRENT_DATE, :days_back)
+                AND (usage_metadata.app_name IS NOT NULL OR sku_name LIKE '%APP%')
         )
         SELECT
-            m.*,
-            ROUND((m.active_days * 100.0 / {days_back}), 1) AS uptime_percentage,
-            ROUND(100.0 - (m.total_errors * 100.0 / NULLIF(m.total_interactions, 0)), 2) AS success_rate,
-            COALESCE((SELECT COUNT(*) FROM power_users), 0) AS power_user_count,
-            ROUND(COALESCE((SELECT COUNT(*) FROM power_users), 0) * 100.0 / NULLIF(m.total_users, 0), 1) AS power_user_ratio
-        FROM metrics m
-        """
+            a.total_unique_users,
+            a.total_unique_apps,
+            a.total_interactions,
+            ROUND(a.total_interactions * 1.0 / NULLIF(a.total_unique_users, 0), 2) AS avg_interactions_per_user,
+            ROUND(a.failed_interactions * 100.0 / NULLIF(a.total_interactions, 0), 2) AS overall_error_rate,
+            a.prev_users,
+            a.prev_interactions,
+            a.total_users,
+            a.total_apps,
+            a.total_errors,
+            a.active_days,
+            ROUND(a.active_days * 100.0 / :days_back, 1) AS uptime_percentage,
+            ROUND(100.0 - (a.total_errors * 100.0 / NULLIF(a.window_interactions, 0)), 2) AS success_rate,
+            pu.power_user_count,
+            ROUND(pu.power_user_count * 100.0 / NULLIF(a.total_users, 0), 1) AS power_user_ratio,
+            k.*
+        FROM audit a
+        CROSS JOIN power_users pu
+        CROSS JOIN cost k
+        """, {'days_back': days_back, 'workspace_id': AppConfig.WORKSPACE_ID,
+              'dbu_cost_rate': AppConfig.DBU_COST_RATE}
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_cost_metrics(days_back=30):
         """Cost and DBU tracking from billing table"""
-        return f"""
+        days_back = _days(days_back)
+        return """
         SELECT
             DATE(usage_date) AS date,
             COALESCE(usage_metadata.app_name, 'Unknown') AS app_name,
             sku_name,
             SUM(usage_quantity) AS total_dbus,
-            ROUND(SUM(usage_quantity) * {AppConfig.DBU_COST_RATE}, 2) AS estimated_cost_usd
+            ROUND(SUM(usage_quantity) * :dbu_cost_rate, 2) AS estimated_cost_usd
         FROM system.billing.usage
-        WHERE usage_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
+        WHERE usage_date >= DATE_SUB(CURRENT_DATE, :days_back)
             AND (usage_metadata.app_name IS NOT NULL OR sku_name LIKE '%APP%')
         GROUP BY DATE(usage_date), COALESCE(usage_metadata.app_name, 'Unknown'), sku_name
         ORDER BY date DESC, total_dbus DESC
-        """
-
-    @staticmethod
-    def get_cost_summary(days_back=30):
-        """Aggregated cost summary"""
-        return f"""
-        SELECT
-            SUM(usage_quantity) AS total_dbus,
-            ROUND(SUM(usage_quantity) * {AppConfig.DBU_COST_RATE}, 2) AS total_cost_usd,
-            COUNT(DISTINCT usage_metadata.app_name) AS apps_with_cost,
-            ROUND(AVG(usage_quantity), 2) AS avg_daily_dbus
-        FROM system.billing.usage
-        WHERE usage_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
-            AND (usage_metadata.app_name IS NOT NULL OR sku_name LIKE '%APP%')
-        """
+        """, {'days_back': days_back, 'dbu_cost_rate': AppConfig.DBU_COST_RATE}
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_security_events(days_back=30):
         """Security-relevant events from audit log"""
+        days_back = _days(days_back)
         return f"""
         SELECT
             DATE(event_time) AS date,
@@ -756,16 +817,18 @@ class DataQueries:
             SUM(CASE WHEN response.status_code >= 400 THEN 1 ELSE 0 END) AS failed_count
         FROM system.access.audit
         WHERE service_name = 'apps'
-            AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
+            AND event_date >= DATE_SUB(CURRENT_DATE, :days_back)
             AND action_name IN ('loginApp', 'updateAppPermissions', 'deleteApp', 'createApp', 'deployApp')
             {DataQueries.WORKSPACE_FILTER}
         GROUP BY DATE(event_time), action_name
         ORDER BY date DESC, event_count DESC
-        """
+        """, {'days_back': days_back, 'workspace_id': AppConfig.WORKSPACE_ID}
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_app_lifecycle_events(days_back=30):
         """App creation, deployment, deletion events"""
+        days_back = _days(days_back)
         return f"""
         SELECT
             DATE(event_time) AS date,
@@ -776,36 +839,233 @@ class DataQueries:
             event_time
         FROM system.access.audit
         WHERE service_name = 'apps'
-            AND event_date >= CURRENT_DATE - INTERVAL '{days_back}' DAY
+            AND event_date >= DATE_SUB(CURRENT_DATE, :days_back)
             AND action_name IN ('createApp', 'deleteApp', 'deployApp', 'startApp', 'stopApp')
             {DataQueries.WORKSPACE_FILTER}
         ORDER BY event_time DESC
         LIMIT 50
-        """
+        """, {'days_back': days_back, 'workspace_id': AppConfig.WORKSPACE_ID}
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_weekly_trends(weeks_back=12):
         """Week-over-week trends for leadership reporting"""
+        weeks_back = _days(int(weeks_back) * 7) // 7
         return f"""
+        WITH daily AS {DataQueries.daily_source(':weeks_back * 7')}
         SELECT
-            DATE_TRUNC('week', event_time) AS week_start,
-            COUNT(DISTINCT user_identity.email) AS weekly_users,
-            COUNT(*) AS weekly_interactions,
-            COUNT(DISTINCT request_params.app_id) AS weekly_active_apps,
-            ROUND(SUM(CASE WHEN response.status_code >= 400 THEN 1 ELSE 0 END) * 100.0 / NULLIF(COUNT(*), 0), 2) AS weekly_error_rate
-        FROM system.access.audit
-        WHERE service_name = 'apps'
-            AND event_date >= CURRENT_DATE - INTERVAL '{weeks_back * 7}' DAY
-            {DataQueries.WORKSPACE_FILTER}
-        GROUP BY DATE_TRUNC('week', event_time)
+            DATE_TRUNC('week', activity_date) AS week_start,
+            COUNT(DISTINCT user_email) AS weekly_users,
+            SUM(click_count) AS weekly_interactions,
+            COUNT(DISTINCT app_id) AS weekly_active_apps,
+            ROUND(SUM(http_error_count) * 100.0 / NULLIF(SUM(click_count), 0), 2) AS weekly_error_rate
+        FROM daily
+        GROUP BY DATE_TRUNC('week', activity_date)
         ORDER BY week_start ASC
-        """
+        """, {'weeks_back': weeks_back, 'workspace_id': AppConfig.WORKSPACE_ID}
+
+
+# Precompile the SQL for the date ranges offered in the dropdown
+for _days_back in (7, 30, 90, 180):
+    for _build in (DataQueries.get_all_summary, DataQueries.get_top_apps,
+                   DataQueries.get_usage_heatmap, DataQueries.get_user_cohorts,
+                   DataQueries.get_error_monitoring, DataQueries.get_user_segmentation):
+        _build(_days_back)
+    DataQueries.get_dau_trend(min(_days_back * 3, 90))
+
+
+# ====================================================================
+# DATA TRANSFORMS
+# ====================================================================
+
+# User segments in bucket order: 100+, 50+, 10+ and under 10 total clicks
+USER_SEGMENTS = (
+    ('Power User', 'segment-power'),
+    ('Active User', 'segment-active'),
+    ('Regular User', 'segment-regular'),
+    ('Casual User', 'segment-casual'),
+)
+
+
+# The numba kernels below are plain Python until first use: numba is imported
+# and each kernel compiled (or loaded from its on-disk cache) by its getter,
+# keeping both off the import path
+def _bucket_segments(total_clicks):
+    """Segment index per user, in USER_SEGMENTS order"""
+    segments = np.empty(total_clicks.shape[0], dtype=np.int64)
+    for i in range(total_clicks.shape[0]):
+        clicks = total_clicks[i]
+        if clicks >= 100:
+            segment = 0
+        elif clicks >= 50:
+            segment = 1
+        elif clicks >= 10:
+            segment = 2
+        else:
+            segment = 3
+        segments[i] = segment
+    return segments
+
+
+@lru_cache(maxsize=None)
+def _get_bucket_segments():
+    """_bucket_segments compiled by numba, on first use"""
+    from numba import njit
+    return njit(cache=True)(_bucket_segments)
+
+
+def _lttb_indices(x, y, n_out):
+    """Row indices kept by Largest-Triangle-Three-Buckets downsampling to n_out points"""
+    n = x.shape[0]
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[n_out - 1] = n - 1
+    bucket_size = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        best_area = -1.0
+        best = int(i * bucket_size) + 1
+        for j in range(int(i * bucket_size) + 1, int((i + 1) * bucket_size) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best_area = area
+                best = j
+        indices[i + 1] = best
+        a = best
+    return indices
+
+
+
+@lru_cache(maxsize=None)
+def _get_lttb_indices():
+    """_lttb_indices compiled by numba, on first use"""
+    from numba import njit
+    return njit(cache=True)(_lttb_indices)
+
+# Daily series trimmed with LTTB, by the (x, y) columns that drive the selection
+TREND_SERIES = {
+    'dau_trend': ('activity_date', 'daily_active_users'),
+    'user_cohorts': ('activity_date', 'total_users'),
+    'error_monitoring': ('activity_date', 'total_requests'),
+}
+
+
+def downsample(table, x_col, y_col, n_out=AppConfig.MAX_TREND_POINTS):
+    """Rows of a time series table kept by LTTB on (x_col, y_col); all columns follow"""
+    if table.num_rows <= n_out:
+        return table
+    x = table.column(x_col).to_numpy().astype('datetime64[s]').astype(np.float64)
+    y = table.column(y_col).to_numpy(zero_copy_only=False).astype(np.float64)
+    return table.take(_get_lttb_indices()(x, y, n_out))
+
+
+def payload_digest(data):
+    """Content hash of a store payload, to detect unchanged results between fetches"""
+    return hashlib.sha1(repr(data).encode()).hexdigest()
+
+
+# Chart query results and the dcc.Store each is written to. A store holds an
+# encode_table payload; {} marks a failed query and None a store not yet loaded
+CHART_STORES = {
+    'dau_trend': 'dau-trend-store',
+    'top_apps': 'top-apps-store',
+    'usage_heatmap': 'usage-heatmap-store',
+    'user_cohorts': 'user-cohorts-store',
+    'error_monitoring': 'error-monitoring-store',
+    'user_segmentation': 'user-segmentation-store',
+}
+
+# Columns each chart callback reads; the rest of a query result never leaves the server
+CHART_COLUMNS = {
+    'dau_trend': ['activity_date', 'daily_active_users', 'total_clicks'],
+    'top_apps': ['app_name', 'click_count', 'unique_users'],
+    'usage_heatmap': ['day_of_week', 'hour_of_day', 'click_count'],
+    'user_cohorts': ['activity_date', 'new_users', 'returning_users'],
+    'error_monitoring': ['activity_date', 'successful_requests', 'failed_requests', 'error_rate_percentage'],
+    'user_segmentation': ['user_email', 'total_clicks', 'apps_accessed', 'days_active', 'avg_clicks_per_day'],
+}
+
+INT32_RANGE = np.iinfo(np.int32)
+
+
+def _fits_int32(column):
+    """Whether every value of an integer column fits in int32 (all-null columns do)"""
+    bounds = pc.min_max(column)
+    low, high = bounds['min'].as_py(), bounds['max'].as_py()
+    return low is None or (INT32_RANGE.min <= low and high <= INT32_RANGE.max)
+
+
+def downcast_table(table):
+    """Narrow integer columns to int32 where every value fits; larger ones stay int64"""
+    return table.cast(pa.schema([
+        field.with_type(pa.int32())
+        if pa.types.is_integer(field.type) and _fits_int32(column) else field
+        for field, column in zip(table.schema, table.columns)
+    ]))
+
+
+def encode_table(table):
+    """Serialize an Arrow table as base64 Arrow IPC for a dcc.Store"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return {
+        'num_rows': table.num_rows,
+        'data_b64': base64.b64encode(sink.getvalue().to_pybytes()).decode('ascii')
+    }
+
+
+# Prepared payloads live as long as their cached query result
+_PAYLOAD_CACHE = WeakKeyDictionary()
+
+
+def chart_payload(name, result):
+    """(store payload, digest) for a chart query result; None payload if it failed.
+
+    Query results are shared from the TTL cache, so repeat fetches inside the
+    refresh window reuse the payload instead of re-sampling and re-hashing.
+    """
+    if result is None:
+        return None, payload_digest(None)
+    cached = _PAYLOAD_CACHE.get(result)
+    if cached is None:
+        table = downsample(result.table, *TREND_SERIES[name]) if name in TREND_SERIES else result.table
+        payload = encode_table(downcast_table(table.select(CHART_COLUMNS[name])))
+        cached = _PAYLOAD_CACHE[result] = (payload, payload_digest(payload))
+    return cached
+
+
+# Growth KPIs derived from the summary row: (output, current, previous)
+GROWTH_METRICS = (
+    ('user_growth_pct', 'total_unique_users', 'prev_users'),
+    ('interaction_growth_pct', 'total_interactions', 'prev_interactions'),
+)
+
+
+def add_growth_pct(kpi):
+    """Add period-over-period growth (percent, 1 dp) to a summary row.
+
+    Growth is None when there is no previous-period value to compare with.
+    """
+    current = np.array([kpi.get(col) for _, col, _ in GROWTH_METRICS], dtype=np.float64)
+    previous = np.array([kpi.get(col) for _, _, col in GROWTH_METRICS], dtype=np.float64)
+    growth = np.round(100.0 * (current - previous) / np.where(previous == 0, np.nan, previous), 1)
+    for (name, _, _), value in zip(GROWTH_METRICS, growth):
+        kpi[name] = None if np.isnan(value) else float(value)
+    return kpi
 
 
 # ====================================================================
 # DASH APP INITIALIZATION
 # ====================================================================
 
+# Theme styles are served by Dash from assets/custom.css
 app = dash.Dash(
     __name__,
     external_stylesheets=[
@@ -818,34 +1078,30 @@ app = dash.Dash(
     update_title="Loading..."
 )
 
-# Inject custom CSS
-app.index_string = f'''
-<!DOCTYPE html>
-<html>
-    <head>
-        {{%metas%}}
-        <title>{{%title%}}</title>
-        {{%favicon%}}
-        {{%css%}}
-        <style>
-        {CUSTOM_CSS}
-        </style>
-    </head>
-    <body>
-        {{%app_entry%}}
-        <footer>
-            {{%config%}}
-            {{%scripts%}}
-            {{%renderer%}}
-        </footer>
-    </body>
-</html>
-'''
+# Dash encodes callback responses through plotly.io.json; orjson serializes the
+# figures' numpy arrays natively instead of converting them to lists first
+pio.json.config.default_engine = 'orjson'
 
 # ====================================================================
 # LAYOUT COMPONENTS
 # ====================================================================
 
+# Card styles depend only on color/height, so each variant is built once
+@lru_cache(maxsize=32)
+def _icon_style(color):
+    return {'fontSize': '1.5rem', 'color': color}
+
+
+@lru_cache(maxsize=32)
+def _icon_container_style(color):
+    return {'backgroundColor': f"{color}15"}
+
+
+@lru_cache(maxsize=32)
+def _graph_style(height):
+    return {'height': f'{height}px'}
+
+
 def create_executive_kpi_card(title, value, change=None, icon="graph-up", color=None):
     """Create an executive-style KPI card"""
 
@@ -867,8 +1123,8 @@ def create_executive_kpi_card(title, value, change=None, icon="graph-up", color=
     return dbc.Card([
         dbc.CardBody([
             html.Div([
-                html.I(className=f"bi bi-{icon}", style={'fontSize': '1.5rem', 'color': color})
-            ], className="kpi-icon-container", style={'backgroundColor': f"{color}15"}),
+                html.I(className=f"bi bi-{icon}", style=_icon_style(color))
+            ], className="kpi-icon-container", style=_icon_container_style(color)),
             html.Div(value, className="kpi-value"),
             html.Div(title, className="kpi-label"),
             change_element
@@ -960,7 +1216,7 @@ def create_chart_card(title, chart_id, subtitle=None, height=400):
         dbc.CardHeader(html.Div(header_content)),
         dbc.CardBody([
             dcc.Loading(
-                dcc.Graph(id=chart_id, style={'height': f'{height}px'}),
+                dcc.Graph(id=chart_id, style=_graph_style(height)),
                 type="circle",
                 color=AppConfig.COLORS['primary']
             )
@@ -1159,21 +1415,17 @@ def create_embedded_dashboard_tab(dashboard_key):
     Returns:
         Dash HTML component with either iframe or placeholder
     """
-    # Get dashboard config
-    dashboard_config = DASHBOARD_CONFIG.get('dashboards', {}).get(dashboard_key, {})
-
-    name = dashboard_config.get('name', dashboard_key.replace('_', ' ').title())
-    description = dashboard_config.get('description', '')
-    icon = dashboard_config.get('icon', 'bar-chart-line')
-    url = dashboard_config.get('url', '')
-    external_url = dashboard_config.get('external_url', url)
-    height = dashboard_config.get('height', 800)
-    background = dashboard_config.get('background', '#FFFFFF')
-    enabled = dashboard_config.get('enabled', False)
-
-    # Also check environment variables as override
-    env_key = f"{dashboard_key.upper()}_URL"
-    url = os.getenv(env_key, url)
+    # Settings are resolved (config + env override) once at startup
+    dashboard_config = RESOLVED_DASHBOARDS.get(dashboard_key) or _resolve_dashboard(dashboard_key, {})
+
+    name = dashboard_config['name']
+    description = dashboard_config['description']
+    icon = dashboard_config['icon']
+    url = dashboard_config['url']
+    external_url = dashboard_config['external_url']
+    height = dashboard_config['height']
+    background = dashboard_config['background']
+    enabled = dashboard_config['enabled']
 
     if url and enabled:
         # Render iframe with dashboard
@@ -1218,18 +1470,23 @@ def create_embedded_dashboard_tab(dashboard_key):
                             'borderRadius': '12px 12px 0 0'
                         }),
 
-                        # Dashboard iframe
-                        html.Iframe(
-                            id=f"dashboard-iframe-{dashboard_key}",
-                            src=url,
-                            style={
-                                'width': '100%',
-                                'height': f'calc(100vh - 280px)',
-                                'border': 'none',
-                                'minHeight': f'{height}px',
-                                'background': background,
-                                'borderRadius': '0 0 12px 12px'
-                            }
+                        # Dashboard iframe, injected on "Load dashboard" so no
+                        # cross-origin session starts until the user asks for it
+                        html.Div(
+                            html.Div(
+                                dbc.Button([
+                                    html.I(className="bi bi-play-circle me-2"),
+                                    "Load dashboard"
+                                ], id={'type': 'dashboard-load', 'index': dashboard_key},
+                                color="primary", outline=True),
+                                className="d-flex align-items-center justify-content-center",
+                                style={
+                                    'minHeight': f'{height}px',
+                                    'background': background,
+                                    'borderRadius': '0 0 12px 12px'
+                                }
+                            ),
+                            id={'type': 'dashboard-frame', 'index': dashboard_key}
                         )
                     ], className="dashboard-container",
                     style={
@@ -1314,6 +1571,23 @@ def create_embedded_dashboard_tab(dashboard_key):
         ])
 
 
+def create_dashboard_iframe(dashboard_key):
+    """Iframe for an enabled embedded dashboard"""
+    dashboard_config = RESOLVED_DASHBOARDS[dashboard_key]
+    return html.Iframe(
+        id=f"dashboard-iframe-{dashboard_key}",
+        src=dashboard_config['url'],
+        style={
+            'width': '100%',
+            'height': 'calc(100vh - 280px)',
+            'border': 'none',
+            'minHeight': f"{dashboard_config['height']}px",
+            'background': dashboard_config['background'],
+            'borderRadius': '0 0 12px 12px'
+        }
+    )
+
+
 def create_logfood_placeholder_tab(tab_name):
     """Legacy placeholder function - redirects to embedded dashboard"""
     if tab_name == "Logfood Analytics":
@@ -1331,7 +1605,9 @@ def create_logfood_placeholder_tab(tab_name):
 app.layout = dbc.Container([
     # Data Stores
     dcc.Store(id='kpi-data-store'),
-    dcc.Store(id='charts-data-store'),
+    *[dcc.Store(id=store_id) for store_id in CHART_STORES.values()],
+    dcc.Store(id='charts-digest-store'),
+    dcc.Store(id='connection-status-store'),
     dcc.Store(id='cost-data-store'),
     dcc.Store(id='security-data-store'),
     dcc.Store(id='weekly-data-store'),
@@ -1421,70 +1697,114 @@ app.layout = dbc.Container([
 # CALLBACKS
 # ====================================================================
 
+# Tab layouts never change at runtime, so each is built once and reused
+STATIC_TABS = {
+    'tab-apps-usage': create_apps_telemetry_tab,
+    'tab-cost-roi': create_cost_roi_tab,
+    'tab-security': create_security_tab,
+    'tab-weekly': create_weekly_trends_tab,
+}
+EMBEDDED_TABS = {
+    'tab-logfood-1': 'logfood_analytics',
+    'tab-logfood-2': 'infrastructure_metrics',
+    'tab-executive': 'executive_summary',
+}
+_TAB_CACHE = {}
+
+
+def _embedded_tab_key(dashboard_key):
+    """Cache key for an embedded tab; a reloaded URL or enabled flag rebuilds it"""
+    dashboard_config = RESOLVED_DASHBOARDS.get(dashboard_key, {})
+    return dashboard_key, dashboard_config.get('url', ''), dashboard_config.get('enabled', False)
+
+
 @app.callback(
     Output('tab-content', 'children'),
     Input('main-tabs', 'active_tab')
 )
 def render_tab_content(active_tab):
     """Render content based on active tab"""
-    if active_tab == "tab-apps-usage":
-        return create_apps_telemetry_tab()
-    elif active_tab == "tab-cost-roi":
-        return create_cost_roi_tab()
-    elif active_tab == "tab-security":
-        return create_security_tab()
-    elif active_tab == "tab-weekly":
-        return create_weekly_trends_tab()
-    elif active_tab == "tab-logfood-1":
-        return create_embedded_dashboard_tab("logfood_analytics")
-    elif active_tab == "tab-logfood-2":
-        return create_embedded_dashboard_tab("infrastructure_metrics")
-    elif active_tab == "tab-executive":
-        return create_embedded_dashboard_tab("executive_summary")
-    return html.Div("Select a tab")
+    if active_tab in STATIC_TABS:
+        key, build = active_tab, STATIC_TABS[active_tab]
+    elif active_tab in EMBEDDED_TABS:
+        dashboard_key = EMBEDDED_TABS[active_tab]
+        key = _embedded_tab_key(dashboard_key)
+        build = lambda: create_embedded_dashboard_tab(dashboard_key)
+    else:
+        return html.Div("Select a tab")
+
+    content = _TAB_CACHE.get(key)
+    if content is None:
+        content = _TAB_CACHE[key] = build()
+    return content
+
+
+@app.callback(
+    Output({'type': 'dashboard-frame', 'index': MATCH}, 'children'),
+    Input({'type': 'dashboard-load', 'index': MATCH}, 'n_clicks'),
+    prevent_initial_call=True
+)
+def load_dashboard_iframe(n_clicks):
+    """Swap an embedded tab's load button for the dashboard iframe"""
+    return create_dashboard_iframe(dash.callback_context.triggered_id['index'])
+
+
+# Prebuild the static tabs so the first click on each is free
+for _tab_id, _build_tab in STATIC_TABS.items():
+    _TAB_CACHE[_tab_id] = _build_tab()
 
 
 @app.callback(
     Output('last-update-time', 'children'),
-    Output('connection-status', 'children'),
     Input('interval-component', 'n_intervals'),
     Input('refresh-button', 'n_clicks')
 )
 def update_timestamp(n_intervals, n_clicks):
-    """Update last refresh timestamp and connection status"""
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    """Update last refresh timestamp"""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Check connection
-    try:
-        if db_conn.connection or db_conn.connect():
-            status = html.Span([
-                html.I(className="bi bi-circle-fill me-1", style={'color': '#00A67E', 'fontSize': '0.5rem'}),
-                "Connected"
-            ], style={'color': '#00A67E', 'fontSize': '0.75rem'})
-        else:
-            status = html.Span([
-                html.I(className="bi bi-circle-fill me-1", style={'color': '#DC3545', 'fontSize': '0.5rem'}),
-                "Disconnected"
-            ], style={'color': '#DC3545', 'fontSize': '0.75rem'})
-    except:
-        status = html.Span([
-            html.I(className="bi bi-circle-fill me-1", style={'color': '#F5A623', 'fontSize': '0.5rem'}),
-            "Unknown"
-        ], style={'color': '#F5A623', 'fontSize': '0.75rem'})
 
-    return now, status
+# Header pill (label, color) per connection_status() result
+_CONNECTION_STATUS = {
+    'connected': ("Connected", '#00A67E'),
+    'disconnected': ("Disconnected", '#DC3545'),
+    'busy': ("Busy", AppConfig.COLORS['warning']),
+}
+
+
+@app.callback(
+    Output('connection-status', 'children'),
+    Output('connection-status-store', 'data'),
+    Input('interval-component', 'n_intervals'),
+    Input('refresh-button', 'n_clicks'),
+    State('connection-status-store', 'data')
+)
+def update_connection_status(n_intervals, n_clicks, last_status):
+    """Update the connection status pill, only when the status changes"""
+    status = connection_status()
+    if status == last_status:
+        return dash.no_update, dash.no_update
+
+    label, color = _CONNECTION_STATUS[status]
+    pill = html.Span([
+        html.I(className="bi bi-circle-fill me-1", style={'color': color, 'fontSize': '0.5rem'}),
+        label
+    ], style={'color': color, 'fontSize': '0.75rem'})
+    return pill, status
 
 
 @app.callback(
     [Output('kpi-data-store', 'data'),
-     Output('charts-data-store', 'data')],
+     *[Output(store_id, 'data') for store_id in CHART_STORES.values()],
+     Output('charts-digest-store', 'data')],
     [Input('interval-component', 'n_intervals'),
      Input('refresh-button', 'n_clicks'),
      Input('date-range-dropdown', 'value'),
      Input('main-tabs', 'active_tab')],
-    State('auto-refresh-switch', 'value')
+    [State('auto-refresh-switch', 'value'),
+     State('charts-digest-store', 'data')]
 )
-def fetch_telemetry_data(n_intervals, n_clicks, days_back, active_tab, auto_refresh):
+def fetch_telemetry_data(n_intervals, n_clicks, days_back, active_tab, auto_refresh, previous_digests):
     """Fetch telemetry data for Apps Usage tab"""
 
     ctx = dash.callback_context
@@ -1493,50 +1813,102 @@ def fetch_telemetry_data(n_intervals, n_clicks, days_back, active_tab, auto_refr
     if ctx.triggered:
         trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
         if trigger_id == 'interval-component' and not auto_refresh:
-            return dash.no_update, dash.no_update
+            return [dash.no_update] * (len(CHART_STORES) + 2)
 
     # Skip data fetch if not on apps usage tab (but still load on initial)
     if ctx.triggered and active_tab != "tab-apps-usage":
         # Only skip if this is a tab change, not initial load
         trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
         if trigger_id == 'main-tabs':
-            return dash.no_update, dash.no_update
+            return [dash.no_update] * (len(CHART_STORES) + 2)
 
     # Default days_back if None
     if days_back is None:
         days_back = 30
 
+    # Manual refresh bypasses (and replaces) cached query results
+    force_refresh = bool(ctx.triggered) and ctx.triggered[0]['prop_id'].split('.')[0] == 'refresh-button'
+
     print(f"Fetching telemetry data for {days_back} days...")
 
     try:
-        # Fetch KPI data
-        kpi_df = db_conn.execute_query(DataQueries.get_kpi_summary(days_back))
-        kpi_data = kpi_df.to_dict('records')[0] if not kpi_df.empty else {}
-        print(f"KPI data: {kpi_data}")
+        # KPI, executive and cost figures arrive together in one summary row
+        queries = {
+            'summary': DataQueries.get_all_summary(days_back),
+            'dau_trend': DataQueries.get_dau_trend(min(days_back * 3, 90)),
+            'top_apps': DataQueries.get_top_apps(days_back),
+            'usage_heatmap': DataQueries.get_usage_heatmap(days_back),
+            'user_cohorts': DataQueries.get_user_cohorts(days_back),
+            'error_monitoring': DataQueries.get_error_monitoring(days_back),
+            'user_segmentation': DataQueries.get_user_segmentation(days_back)
+        }
 
-        # Fetch charts data
-        charts_data = {
-            'dau_trend': db_conn.execute_query(DataQueries.get_dau_trend(min(days_back * 3, 90))).to_dict('records'),
-            'top_apps': db_conn.execute_query(DataQueries.get_top_apps(days_back)).to_dict('records'),
-            'usage_heatmap': db_conn.execute_query(DataQueries.get_usage_heatmap(days_back)).to_dict('records'),
-            'user_cohorts': db_conn.execute_query(DataQueries.get_user_cohorts(days_back)).to_dict('records'),
-            'error_monitoring': db_conn.execute_query(DataQueries.get_error_monitoring(days_back)).to_dict('records'),
-            'user_segmentation': db_conn.execute_query(DataQueries.get_user_segmentation(days_back)).to_dict('records')
+        # Queries are independent and I/O-bound, so run them concurrently
+        results = {}
+        futures = {
+            _QUERY_EXECUTOR.submit(db_conn.execute_query, query, params, force_refresh=force_refresh): name
+            for name, (query, params) in queries.items()
         }
-        print(f"Charts data loaded: {list(charts_data.keys())}")
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                # Only this panel shows as unavailable; the others still render
+                print(f"Query {name} failed: {e}")
+                results[name] = None
 
-        return kpi_data, charts_data
+        kpi_result = results.pop('summary')
+        kpi_data = add_growth_pct(kpi_result.to_pylist()[0]) if kpi_result is not None and not kpi_result.empty else {}
+        print(f"KPI data: {kpi_data}")
+
+        # Charts data as encoded Arrow tables, one store per chart
+        payloads = {name: chart_payload(name, results[name]) for name in CHART_STORES}
+        print(f"Charts data loaded: {list(payloads.keys())}")
+
+        digests = {name: digest for name, (_, digest) in payloads.items()}
+        digests['summary'] = payload_digest(kpi_data)
+        previous_digests = previous_digests or {}
+
+        # Changed charts' figures build in parallel while their stores make the
+        # round trip to the browser that triggers the chart callbacks
+        for name, (payload, digest) in payloads.items():
+            if payload is not None and digest != previous_digests.get(name):
+                prebuild_figure(name, payload, digest)
+
+        # Stores whose content is unchanged since the last fetch are left alone,
+        # so neither they nor their chart callbacks are re-sent
+        def output(name, data):
+            if digests[name] == previous_digests.get(name):
+                return dash.no_update
+            return {} if data is None else data
+
+        return [
+            kpi_data if digests['summary'] != previous_digests.get('summary') else dash.no_update,
+            *(output(name, payload) for name, (payload, _) in payloads.items()),
+            digests
+        ]
     except Exception as e:
         print(f"Error fetching data: {e}")
         import traceback
         traceback.print_exc()
-        return {}, {}
+        return [{}] + [{}] * len(CHART_STORES) + [None]
 
 
 # ================================================================
 # KPI CARD CALLBACKS
 # ================================================================
 
+# Shown until the first summary arrives; built once and shared by every session
+_KPI_PLACEHOLDERS = (create_executive_kpi_card("Loading...", "-", None, "hourglass"),) * 4
+
+# Error-rate card (status, icon, color), keyed by whether the rate is under the 5% SLA
+_ERROR_RATE_STATUS = {
+    True: ("Healthy", "shield-check", AppConfig.COLORS['success']),
+    False: ("Needs Attention", "exclamation-triangle-fill", AppConfig.COLORS['danger']),
+}
+
+
 @app.callback(
     [Output('kpi-card-users', 'children'),
      Output('kpi-card-apps', 'children'),
@@ -1547,11 +1919,17 @@ def fetch_telemetry_data(n_intervals, n_clicks, days_back, active_tab, auto_refr
 def update_kpi_cards(kpi_data):
     """Update main KPI cards"""
     if not kpi_data:
-        return [create_executive_kpi_card("Loading...", "-", None, "hourglass")] * 4
+        return _KPI_PLACEHOLDERS
+
+    # NULL aggregates (no activity) display as zero
+    users = kpi_data.get('total_unique_users') or 0
+    apps = kpi_data.get('total_unique_apps') or 0
+    interactions = kpi_data.get('total_interactions') or 0
+    error_rate = kpi_data.get('overall_error_rate') or 0
 
     card_users = create_executive_kpi_card(
         "Total Users",
-        f"{kpi_data.get('total_unique_users', 0):,}",
+        f"{users:,}",
         kpi_data.get('user_growth_pct'),
         "people-fill",
         AppConfig.COLORS['primary']
@@ -1559,7 +1937,7 @@ def update_kpi_cards(kpi_data):
 
     card_apps = create_executive_kpi_card(
         "Active Apps",
-        f"{kpi_data.get('total_unique_apps', 0):,}",
+        f"{apps:,}",
         None,
         "grid-3x3-gap-fill",
         AppConfig.COLORS['info']
@@ -1567,20 +1945,14 @@ def update_kpi_cards(kpi_data):
 
     card_interactions = create_executive_kpi_card(
         "Interactions",
-        f"{kpi_data.get('total_interactions', 0):,}",
+        f"{interactions:,}",
         kpi_data.get('interaction_growth_pct'),
         "cursor-fill",
         AppConfig.COLORS['success']
     )
 
-    error_rate = kpi_data.get('overall_error_rate', 0)
-    card_error = create_executive_kpi_card(
-        "Error Rate",
-        f"{error_rate:.2f}%",
-        "Healthy" if error_rate < 5 else "Needs Attention",
-        "shield-check" if error_rate < 5 else "exclamation-triangle-fill",
-        AppConfig.COLORS['success'] if error_rate < 5 else AppConfig.COLORS['danger']
-    )
+    status, icon, color = _ERROR_RATE_STATUS[error_rate < 5]
+    card_error = create_executive_kpi_card("Error Rate", f"{error_rate:.2f}%", status, icon, color)
 
     return card_users, card_apps, card_interactions, card_error
 
@@ -1589,316 +1961,454 @@ def update_kpi_cards(kpi_data):
 # CHART CALLBACKS
 # ================================================================
 
+def _has_rows(payload):
+    """Whether a stored encode_table result holds any rows"""
+    return bool(payload) and payload['num_rows'] > 0
+
+
+def _columns(payload, *names):
+    """Named columns of a stored encode_table result as numpy arrays, in order"""
+    table = pa.ipc.open_stream(base64.b64decode(payload['data_b64'])).read_all()
+    return tuple(table.column(name).to_numpy(zero_copy_only=False) for name in names)
+
+
+def unavailable_figure(height):
+    """Placeholder figure for a panel whose query failed or returned no rows"""
+    return {
+        'data': [],
+        'layout': {
+            'height': height,
+            'xaxis': {'visible': False},
+            'yaxis': {'visible': False},
+            'annotations': [{
+                'text': "Data unavailable",
+                'showarrow': False,
+                'xref': 'paper', 'yref': 'paper', 'x': 0.5, 'y': 0.5,
+                'font': {'size': 14, 'color': AppConfig.COLORS['text_secondary']}
+            }],
+            'plot_bgcolor': 'rgba(0,0,0,0)',
+            'paper_bgcolor': 'rgba(0,0,0,0)'
+        }
+    }
+
+
+# Plotly JSON per (chart, store digest), held as the future of its build so
+# concurrent requests for the same content share one build
+_FIGURE_CACHE = LRUCache(maxsize=64)
+_FIGURE_CACHE_LOCK = Lock()
+
+# Figure builds are numpy-heavy and independent, so they run on their own pool;
+# fetch_telemetry_data starts them before the chart callbacks ask for them
+_FIGURE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='telemetry-figure')
+
+# Cached figure builder per chart store name, for prebuilding
+FIGURE_BUILDERS = {}
+
+
+def figure_future(build, data, digest):
+    """Future for a chart's figure JSON, started on the figure pool if not cached"""
+    key = (build.__name__, digest)
+    with _FIGURE_CACHE_LOCK:
+        future = _FIGURE_CACHE.get(key)
+        if future is None:
+            future = _FIGURE_CACHE[key] = _FIGURE_EXECUTOR.submit(build, data)
+    return future
+
+
+def prebuild_figure(chart, data, digest):
+    """Start building a chart's figure for new store data, if the chart has one"""
+    if chart in FIGURE_BUILDERS:
+        figure_future(FIGURE_BUILDERS[chart], data, digest)
+
+
+def cached_figure(chart):
+    """Memoize a chart callback's figure JSON on the content of its store data.
+
+    Until its store is first loaded a chart is left as the empty graph it
+    mounted with, rather than sent a blank figure.
+    """
+    def decorate(build):
+        @wraps(build)
+        def wrapper(data):
+            if data is None:
+                return dash.no_update
+            digest = payload_digest(data)
+            future = figure_future(build, data, digest)
+            try:
+                return future.result()
+            except Exception:
+                # A failed build is not cached; the next update retries it
+                with _FIGURE_CACHE_LOCK:
+                    if _FIGURE_CACHE.get((build.__name__, digest)) is future:
+                        del _FIGURE_CACHE[(build.__name__, digest)]
+                raise
+        FIGURE_BUILDERS[chart] = build
+        return wrapper
+    return decorate
+
+
+# Figures are built as plain dicts, skipping plotly's per-property validation.
+# The named template is resolved once, since the browser only understands dicts
+PLOTLY_WHITE = pio.templates['plotly_white'].to_plotly_json()
+GRID_COLOR = '#E2E8F0'
+TOP_LEGEND = {'orientation': "h", 'yanchor': "bottom", 'y': 1.02, 'xanchor': "right", 'x': 1}
+
+
+def chart_layout(height, margin, **layout):
+    """Layout shared by the usage charts: white template, transparent background"""
+    return {
+        'template': PLOTLY_WHITE,
+        'height': height,
+        'margin': margin,
+        'plot_bgcolor': 'rgba(0,0,0,0)',
+        'paper_bgcolor': 'rgba(0,0,0,0)',
+        **layout
+    }
+
+
+def secondary_y_axes(x_title, y_title, y2_title):
+    """Axes for a chart with a right-hand secondary y axis (as make_subplots lays them out)"""
+    return {
+        'xaxis': {'domain': [0.0, 0.94], 'anchor': 'y', 'title': {'text': x_title}, 'gridcolor': GRID_COLOR},
+        'yaxis': {'domain': [0.0, 1.0], 'anchor': 'x', 'title': {'text': y_title}, 'gridcolor': GRID_COLOR},
+        'yaxis2': {'anchor': 'x', 'overlaying': 'y', 'side': 'right',
+                   'title': {'text': y2_title}, 'gridcolor': GRID_COLOR},
+    }
+
+
+# Chart layouts never depend on the data, so each is built once and shared
+DAU_LAYOUT = chart_layout(
+    380, {'l': 20, 'r': 20, 't': 30, 'b': 20},
+    hovermode='x unified',
+    legend=TOP_LEGEND,
+    **secondary_y_axes("Date", "Daily Active Users", "Total Clicks")
+)
+
+TOP_APPS_LAYOUT = chart_layout(
+    380, {'l': 20, 'r': 80, 't': 30, 'b': 20},
+    xaxis={'title': {'text': "Total Clicks"}}
+)
+
+# Heatmap axes: Monday-first weekdays by hour of day
+DAY_ORDER = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+HOUR_LABELS = tuple(f"{h:02d}:00" for h in range(24))
+
+HEATMAP_LAYOUT = chart_layout(
+    330, {'l': 20, 'r': 20, 't': 20, 'b': 20},
+    xaxis={'title': {'text': "Hour of Day"}},
+    yaxis={'title': {'text': ""}}
+)
+
+COHORTS_LAYOUT = chart_layout(
+    380, {'l': 20, 'r': 20, 't': 30, 'b': 20},
+    hovermode='x unified',
+    xaxis={'title': {'text': 'Date'}},
+    yaxis={'title': {'text': 'User Count'}},
+    legend=TOP_LEGEND
+)
+
+ERROR_MONITORING_LAYOUT = chart_layout(
+    380, {'l': 20, 'r': 20, 't': 30, 'b': 20},
+    hovermode='x unified',
+    barmode='stack',
+    legend=TOP_LEGEND,
+    # 5% SLA threshold line on the error-rate axis
+    shapes=[{
+        'type': 'line', 'xref': 'x domain', 'x0': 0, 'x1': 1,
+        'yref': 'y2', 'y0': 5, 'y1': 5,
+        'line': {'color': AppConfig.COLORS['danger'], 'dash': 'dash'}
+    }],
+    annotations=[{
+        'text': "5% SLA Threshold", 'showarrow': False,
+        'xref': 'x domain', 'x': 1, 'xanchor': 'right',
+        'yref': 'y2', 'y': 5, 'yanchor': 'bottom'
+    }],
+    **secondary_y_axes("Date", "Request Count", "Error Rate (%)")
+)
+
+
 @app.callback(
     Output('dau-trend-chart', 'figure'),
-    Input('charts-data-store', 'data')
+    Input(CHART_STORES['dau_trend'], 'data')
 )
-def update_dau_chart(charts_data):
+@cached_figure('dau_trend')
+def update_dau_chart(data):
     """Update DAU trend chart"""
-    if not charts_data or 'dau_trend' not in charts_data:
-        return go.Figure()
-
-    df = pd.DataFrame(charts_data['dau_trend'])
-    if df.empty:
-        return go.Figure()
-
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
-
-    fig.add_trace(
-        go.Scatter(
-            x=df['activity_date'],
-            y=df['daily_active_users'],
-            name='Daily Active Users',
-            line=dict(color=AppConfig.COLORS['primary'], width=3),
-            mode='lines+markers',
-            marker=dict(size=4)
-        ),
-        secondary_y=False
-    )
+    if not _has_rows(data):
+        return unavailable_figure(380)
 
-    fig.add_trace(
-        go.Scatter(
-            x=df['activity_date'],
-            y=df['total_clicks'],
-            name='Total Clicks',
-            line=dict(color=AppConfig.COLORS['secondary_light'], width=2, dash='dash'),
-            mode='lines'
-        ),
-        secondary_y=True
+    dates, daily_users, total_clicks = _columns(
+        data, 'activity_date', 'daily_active_users', 'total_clicks'
     )
 
-    fig.update_xaxes(title_text="Date", gridcolor='#E2E8F0')
-    fig.update_yaxes(title_text="Daily Active Users", secondary_y=False, gridcolor='#E2E8F0')
-    fig.update_yaxes(title_text="Total Clicks", secondary_y=True, gridcolor='#E2E8F0')
-
-    fig.update_layout(
-        hovermode='x unified',
-        template='plotly_white',
-        height=380,
-        margin=dict(l=20, r=20, t=30, b=20),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
-    )
-
-    return fig
+    return {
+        'data': [
+            {
+                'type': 'scatter',
+                'x': dates,
+                'y': daily_users,
+                'name': 'Daily Active Users',
+                'line': {'color': AppConfig.COLORS['primary'], 'width': 3},
+                'mode': 'lines+markers',
+                'marker': {'size': 4},
+                'xaxis': 'x', 'yaxis': 'y'
+            },
+            {
+                'type': 'scatter',
+                'x': dates,
+                'y': total_clicks,
+                'name': 'Total Clicks',
+                'line': {'color': AppConfig.COLORS['secondary_light'], 'width': 2, 'dash': 'dash'},
+                'mode': 'lines',
+                'xaxis': 'x', 'yaxis': 'y2'
+            },
+        ],
+        'layout': DAU_LAYOUT
+    }
 
 
 @app.callback(
     Output('top-apps-chart', 'figure'),
-    Input('charts-data-store', 'data')
+    Input(CHART_STORES['top_apps'], 'data')
 )
-def update_top_apps_chart(charts_data):
+@cached_figure('top_apps')
+def update_top_apps_chart(data):
     """Update top apps chart"""
-    if not charts_data or 'top_apps' not in charts_data:
-        return go.Figure()
-
-    df = pd.DataFrame(charts_data['top_apps'])
-    if df.empty:
-        return go.Figure()
-
-    # Sort for display
-    df = df.sort_values('click_count', ascending=True)
-
-    fig = go.Figure(go.Bar(
-        y=df['app_name'],
-        x=df['click_count'],
-        orientation='h',
-        marker=dict(
-            color=df['unique_users'],
-            colorscale=[[0, AppConfig.COLORS['secondary_light']], [1, AppConfig.COLORS['primary']]],
-            showscale=True,
-            colorbar=dict(title="Users", thickness=15)
-        ),
-        text=df['click_count'],
-        textposition='outside',
-        hovertemplate="<b>%{y}</b><br>Clicks: %{x:,}<br>Users: %{marker.color:,}<extra></extra>"
-    ))
-
-    fig.update_layout(
-        template='plotly_white',
-        height=380,
-        margin=dict(l=20, r=80, t=30, b=20),
-        xaxis_title="Total Clicks",
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
+    if not _has_rows(data):
+        return unavailable_figure(380)
+
+    # Ascending by click count so the top app is drawn last (on top)
+    app_names, click_counts, unique_users = _columns(
+        data, 'app_name', 'click_count', 'unique_users'
     )
+    order = np.argsort(click_counts, kind='stable')
+    app_names, click_counts, unique_users = app_names[order], click_counts[order], unique_users[order]
 
-    return fig
+    return {
+        'data': [{
+            'type': 'bar',
+            'y': app_names,
+            'x': click_counts,
+            'orientation': 'h',
+            'marker': {
+                'color': unique_users,
+                'colorscale': [[0, AppConfig.COLORS['secondary_light']], [1, AppConfig.COLORS['primary']]],
+                'showscale': True,
+                'colorbar': {'title': {'text': "Users"}, 'thickness': 15}
+            },
+            'text': [str(count) for count in click_counts],
+            'textposition': 'outside',
+            'hovertemplate': "<b>%{y}</b><br>Clicks: %{x:,}<br>Users: %{marker.color:,}<extra></extra>"
+        }],
+        'layout': TOP_APPS_LAYOUT
+    }
 
 
 @app.callback(
     Output('usage-heatmap', 'figure'),
-    Input('charts-data-store', 'data')
+    Input(CHART_STORES['usage_heatmap'], 'data')
 )
-def update_usage_heatmap(charts_data):
+@cached_figure('usage_heatmap')
+def update_usage_heatmap(data):
     """Update usage heatmap"""
-    if not charts_data or 'usage_heatmap' not in charts_data:
-        return go.Figure()
-
-    df = pd.DataFrame(charts_data['usage_heatmap'])
-    if df.empty:
-        return go.Figure()
-
-    # Pivot data for heatmap
-    heatmap_data = df.pivot(index='day_name', columns='hour_of_day', values='click_count').fillna(0)
-
-    # Reorder days
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    heatmap_data = heatmap_data.reindex([d for d in day_order if d in heatmap_data.index])
-
-    fig = go.Figure(data=go.Heatmap(
-        z=heatmap_data.values,
-        x=[f"{h:02d}:00" for h in heatmap_data.columns],
-        y=heatmap_data.index,
-        colorscale=[[0, '#F8FAFC'], [0.5, AppConfig.COLORS['warning']], [1, AppConfig.COLORS['primary']]],
-        hovertemplate='<b>%{y}</b> at %{x}<br>Clicks: %{z:,}<extra></extra>',
-        showscale=True,
-        colorbar=dict(title="Clicks", thickness=15)
-    ))
-
-    fig.update_layout(
-        template='plotly_white',
-        height=330,
-        margin=dict(l=20, r=20, t=20, b=20),
-        xaxis_title="Hour of Day",
-        yaxis_title="",
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
+    if not _has_rows(data):
+        return unavailable_figure(330)
+
+    day_of_week, hour_of_day, click_count = _columns(
+        data, 'day_of_week', 'hour_of_day', 'click_count'
     )
 
-    return fig
+    # Accumulate into a Monday-first day x hour grid (DAYOFWEEK is 1 = Sunday);
+    # np.add.at sums repeated cells where plain fancy assignment would keep one
+    heatmap_values = np.zeros((7, 24), dtype=np.int64)
+    np.add.at(heatmap_values, ((day_of_week + 5) % 7, hour_of_day), click_count)
+
+    return {
+        'data': [{
+            'type': 'heatmap',
+            'z': heatmap_values,
+            'x': HOUR_LABELS,
+            'y': DAY_ORDER,
+            'colorscale': [[0, '#F8FAFC'], [0.5, AppConfig.COLORS['warning']], [1, AppConfig.COLORS['primary']]],
+            'hovertemplate': '<b>%{y}</b> at %{x}<br>Clicks: %{z:,}<extra></extra>',
+            'showscale': True,
+            'colorbar': {'title': {'text': "Clicks"}, 'thickness': 15}
+        }],
+        'layout': HEATMAP_LAYOUT
+    }
 
 
 @app.callback(
     Output('user-cohorts-chart', 'figure'),
-    Input('charts-data-store', 'data')
+    Input(CHART_STORES['user_cohorts'], 'data')
 )
-def update_user_cohorts_chart(charts_data):
+@cached_figure('user_cohorts')
+def update_user_cohorts_chart(data):
     """Update user cohorts chart"""
-    if not charts_data or 'user_cohorts' not in charts_data:
-        return go.Figure()
-
-    df = pd.DataFrame(charts_data['user_cohorts'])
-    if df.empty:
-        return go.Figure()
-
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=df['activity_date'],
-        y=df['new_users'],
-        name='New Users',
-        stackgroup='one',
-        fillcolor=AppConfig.COLORS['primary'],
-        line=dict(width=0.5, color=AppConfig.COLORS['primary'])
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=df['activity_date'],
-        y=df['returning_users'],
-        name='Returning Users',
-        stackgroup='one',
-        fillcolor=AppConfig.COLORS['success'],
-        line=dict(width=0.5, color=AppConfig.COLORS['success'])
-    ))
-
-    fig.update_layout(
-        hovermode='x unified',
-        template='plotly_white',
-        height=380,
-        margin=dict(l=20, r=20, t=30, b=20),
-        xaxis_title='Date',
-        yaxis_title='User Count',
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
+    if not _has_rows(data):
+        return unavailable_figure(380)
+
+    dates, new_users, returning_users = _columns(
+        data, 'activity_date', 'new_users', 'returning_users'
     )
 
-    return fig
+    return {
+        'data': [
+            {
+                'type': 'scatter',
+                'x': dates,
+                'y': new_users,
+                'name': 'New Users',
+                'stackgroup': 'one',
+                'fillcolor': AppConfig.COLORS['primary'],
+                'line': {'width': 0.5, 'color': AppConfig.COLORS['primary']}
+            },
+            {
+                'type': 'scatter',
+                'x': dates,
+                'y': returning_users,
+                'name': 'Returning Users',
+                'stackgroup': 'one',
+                'fillcolor': AppConfig.COLORS['success'],
+                'line': {'width': 0.5, 'color': AppConfig.COLORS['success']}
+            },
+        ],
+        'layout': COHORTS_LAYOUT
+    }
 
 
 @app.callback(
     Output('error-monitoring-chart', 'figure'),
-    Input('charts-data-store', 'data')
+    Input(CHART_STORES['error_monitoring'], 'data')
 )
-def update_error_monitoring_chart(charts_data):
+@cached_figure('error_monitoring')
+def update_error_monitoring_chart(data):
     """Update error monitoring chart"""
-    if not charts_data or 'error_monitoring' not in charts_data:
-        return go.Figure()
-
-    df = pd.DataFrame(charts_data['error_monitoring'])
-    if df.empty:
-        return go.Figure()
-
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
-
-    fig.add_trace(
-        go.Bar(
-            x=df['activity_date'],
-            y=df['successful_requests'],
-            name='Successful',
-            marker_color=AppConfig.COLORS['success'],
-            opacity=0.8
-        ),
-        secondary_y=False
-    )
+    if not _has_rows(data):
+        return unavailable_figure(380)
 
-    fig.add_trace(
-        go.Bar(
-            x=df['activity_date'],
-            y=df['failed_requests'],
-            name='Failed',
-            marker_color=AppConfig.COLORS['danger'],
-            opacity=0.8
-        ),
-        secondary_y=False
+    dates, successful, failed, error_rate = _columns(
+        data,
+        'activity_date', 'successful_requests', 'failed_requests', 'error_rate_percentage'
     )
 
-    fig.add_trace(
-        go.Scatter(
-            x=df['activity_date'],
-            y=df['error_rate_percentage'],
-            name='Error Rate %',
-            line=dict(color=AppConfig.COLORS['warning'], width=3),
-            mode='lines+markers',
-            marker=dict(size=6)
-        ),
-        secondary_y=True
-    )
+    return {
+        'data': [
+            {
+                'type': 'bar',
+                'x': dates,
+                'y': successful,
+                'name': 'Successful',
+                'marker': {'color': AppConfig.COLORS['success']},
+                'opacity': 0.8,
+                'xaxis': 'x', 'yaxis': 'y'
+            },
+            {
+                'type': 'bar',
+                'x': dates,
+                'y': failed,
+                'name': 'Failed',
+                'marker': {'color': AppConfig.COLORS['danger']},
+                'opacity': 0.8,
+                'xaxis': 'x', 'yaxis': 'y'
+            },
+            {
+                'type': 'scatter',
+                'x': dates,
+                'y': error_rate,
+                'name': 'Error Rate %',
+                'line': {'color': AppConfig.COLORS['warning'], 'width': 3},
+                'mode': 'lines+markers',
+                'marker': {'size': 6},
+                'xaxis': 'x', 'yaxis': 'y2'
+            },
+        ],
+        'layout': ERROR_MONITORING_LAYOUT
+    }
 
-    # Add threshold line
-    fig.add_hline(
-        y=5,
-        line_dash="dash",
-        line_color=AppConfig.COLORS['danger'],
-        annotation_text="5% SLA Threshold",
-        annotation_position="top right",
-        secondary_y=True
-    )
 
-    fig.update_xaxes(title_text="Date", gridcolor='#E2E8F0')
-    fig.update_yaxes(title_text="Request Count", secondary_y=False, gridcolor='#E2E8F0')
-    fig.update_yaxes(title_text="Error Rate (%)", secondary_y=True, gridcolor='#E2E8F0')
-
-    fig.update_layout(
-        hovermode='x unified',
-        template='plotly_white',
-        height=380,
-        margin=dict(l=20, r=20, t=30, b=20),
-        barmode='stack',
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
-    )
+# Table cells are emitted in Dash's serialized {type, namespace, props} form,
+# skipping the html.* constructor and prop validation for every cell
+TEXT_END = "text-end"
+
 
-    return fig
+def _html_element(tag, children, className=None):
+    """Serialized dash html element, as the renderer receives it"""
+    props = {'children': children}
+    if className is not None:
+        props['className'] = className
+    return {'type': tag, 'namespace': 'dash_html_components', 'props': props}
+
+
+# One badge per segment, shared by every row (rows only read them when serialized)
+SEGMENT_BADGES = tuple(
+    _html_element('Span', label, f"segment-badge {badge_class}")
+    for label, badge_class in USER_SEGMENTS
+)
+
+SEGMENT_TABLE_HEADER = _html_element('Thead', [
+    _html_element('Tr', [
+        _html_element('Th', "User Email"),
+        _html_element('Th', "Segment"),
+        _html_element('Th', "Total Clicks", TEXT_END),
+        _html_element('Th', "Apps", TEXT_END),
+        _html_element('Th', "Days Active", TEXT_END),
+        _html_element('Th', "Avg/Day", TEXT_END),
+    ])
+])
 
 
 @app.callback(
     Output('user-segmentation-table', 'children'),
-    Input('charts-data-store', 'data')
+    Input(CHART_STORES['user_segmentation'], 'data')
 )
-def update_user_segmentation_table(charts_data):
+def update_user_segmentation_table(data):
     """Update user segmentation table with modern styling"""
-    if not charts_data or 'user_segmentation' not in charts_data:
-        return html.Div("No data available", className="text-muted text-center py-4")
+    if data is None:
+        # Not loaded yet; left as mounted, like the charts
+        return dash.no_update
+    if not data:
+        return dbc.Alert("Data unavailable", color="warning", className="mb-0")
 
-    df = pd.DataFrame(charts_data['user_segmentation'])
-    if df.empty:
+    if not _has_rows(data):
         return html.Div("No data available", className="text-muted text-center py-4")
 
-    # Create segment badge
-    def get_segment_badge(segment):
-        badge_class = {
-            'Power User': 'segment-power',
-            'Active User': 'segment-active',
-            'Regular User': 'segment-regular',
-            'Casual User': 'segment-casual'
-        }.get(segment, 'segment-casual')
-        return html.Span(segment, className=f"segment-badge {badge_class}")
+    emails, total_clicks, apps, days, avg_per_day = _columns(
+        data, 'user_email', 'total_clicks', 'apps_accessed', 'days_active', 'avg_clicks_per_day'
+    )
+
+    # Only the first 20 users are shown; slice and format those column-wise
+    emails, clicks, apps, days, avg_per_day = (
+        column[:20] for column in (emails, total_clicks, apps, days, avg_per_day)
+    )
+    # Bucket the shown users into segments in one compiled pass
+    segments = _get_bucket_segments()(clicks.astype(np.int64, copy=False))
+    emails = pa.array(emails, pa.string())
+    emails = pc.if_else(
+        pc.greater(pc.utf8_length(emails), 40),
+        pc.binary_join_element_wise(pc.utf8_slice_codeunits(emails, 0, 40), "...", ""),
+        emails
+    ).to_pylist()
+    # printf-style formats have no thousands separator, so clicks map str.format
+    clicks_text = list(map("{:,}".format, clicks.tolist()))
+    apps_text = np.char.mod('%d', apps).tolist()
+    days_text = np.char.mod('%d', days).tolist()
+    avg_text = np.char.mod('%.1f', avg_per_day.astype(np.float64)).tolist()
 
     # Create table
     table = dbc.Table([
-        html.Thead([
-            html.Tr([
-                html.Th("User Email"),
-                html.Th("Segment"),
-                html.Th("Total Clicks", className="text-end"),
-                html.Th("Apps", className="text-end"),
-                html.Th("Days Active", className="text-end"),
-                html.Th("Avg/Day", className="text-end"),
-            ])
-        ]),
-        html.Tbody([
-            html.Tr([
-                html.Td(row['user_email'][:40] + "..." if len(str(row['user_email'])) > 40 else row['user_email']),
-                html.Td(get_segment_badge(row['user_segment'])),
-                html.Td(f"{row['total_clicks']:,}", className="text-end"),
-                html.Td(f"{row['apps_accessed']}", className="text-end"),
-                html.Td(f"{row['days_active']}", className="text-end"),
-                html.Td(f"{row['avg_clicks_per_day']:.1f}", className="text-end"),
-            ]) for _, row in df.head(20).iterrows()
+        SEGMENT_TABLE_HEADER,
+        _html_element('Tbody', [
+            _html_element('Tr', [
+                _html_element('Td', email),
+                _html_element('Td', SEGMENT_BADGES[segment]),
+                _html_element('Td', click_text, TEXT_END),
+                _html_element('Td', app_text, TEXT_END),
+                _html_element('Td', day_text, TEXT_END),
+                _html_element('Td', avg, TEXT_END),
+            ]) for email, segment, click_text, app_text, day_text, avg in zip(
+                emails, segments, clicks_text, apps_text, days_text, avg_text
+            )
         ])
     ], className="table-executive", striped=False, hover=True, responsive=True)
 